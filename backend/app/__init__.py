@@ -1,13 +1,18 @@
 from flask import Flask
 from flask_cors import CORS
-from flasgger import Swagger
-from app.extensions import db, jwt, migrate
+from app.extensions import (db, jwt, migrate, catalog_cache, admins,
+                            password_hasher, query_stats, metrics, read_replica,
+                            idempotency_sweeper, async_db)
 from app.config import config
+from app.utils.database import configure_engine_options, init_sqlite_pragmas
+from app.utils.docs import init_docs
+from app.utils.serialization import init_json_provider
 
 
 def create_app(config_name='development'):
     app = Flask(__name__)
     app.config.from_object(config[config_name])
+    init_json_provider(app)
 
     # CORS configuration
     cors_origins = [
@@ -17,53 +22,34 @@ def create_app(config_name='development'):
         "https://devmart-frontend.netlify.app",
         "https://devmart-frontend.vercel.app",   # Production frontend (Vercel)
     ]
+    # Primary-Read-Until: read-your-writes con réplica (ver read_replica.py)
     CORS(app, resources={
         r"/api/*": {"origins": cors_origins},
         r"/*": {"origins": cors_origins}
-    })
+    }, expose_headers=['Primary-Read-Until'])
 
-    swagger_config = {
-        "headers": [],
-        "specs": [{
-            "endpoint": 'apispec',
-            "route": '/apispec.json',
-        }],
-        "static_url_path": "/flasgger_static",
-        "swagger_ui": True,
-        "specs_route": "/docs",
-        "openapi": "3.0.0"
-    }
-
-    swagger_template = {
-        "info": {
-            "title": "DevMart API",
-            "description": "E-commerce REST API with JWT authentication and role-based access control",
-            "version": "1.0.0"
-        },
-        "components": {
-            "securitySchemes": {
-                "Bearer": {
-                    "type": "http",
-                    "scheme": "bearer",
-                    "bearerFormat": "JWT",
-                    "description": "JWT Authorization header using Bearer scheme"
-                }
-            }
-        },
-        "security": [{"Bearer": []}]
-    }
-
-    Swagger(app, config=swagger_config, template=swagger_template)
+    init_docs(app)
 
+    configure_engine_options(app)
+    metrics.init_app(app)
+    read_replica.init_app(app)
+    async_db.init_app(app)
     db.init_app(app)
+    init_sqlite_pragmas(app)
     jwt.init_app(app)
     migrate.init_app(app, db)
+    catalog_cache.init_app(app)
+    admins.init_app(app)
+    password_hasher.init_app(app)
+    query_stats.init_app(app)
+    idempotency_sweeper.init_app(app)
 
-    from app.routes import auth, products, categories, orders, health
+    from app.routes import auth, products, categories, orders, health, analytics
     app.register_blueprint(health.bp)
     app.register_blueprint(auth.bp)
     app.register_blueprint(products.bp)
     app.register_blueprint(categories.bp)
     app.register_blueprint(orders.bp)
+    app.register_blueprint(analytics.bp)
 
     return app
@@ -0,0 +1,3 @@
+from app import create_app
+from app.utils.asgi import AsgiApp
+application = AsgiApp(create_app())
@@ -10,8 +10,112 @@ class Config:
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///shop.db')
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Pool de conexiones (no aplica a SQLite en memoria)
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', 1800))
+    # Sin definir, solo para bases de datos de red: en SQLite no hay conexión
+    # que pueda caerse y el ping es una consulta más en cada checkout
+    DB_POOL_PRE_PING = {'true': True, 'false': False}.get(os.getenv('DB_POOL_PRE_PING'))
+
+    # Réplica de lectura para los GET del catálogo y del historial de pedidos.
+    # Sin DATABASE_REPLICA_URL, en SQLite se usa el mismo fichero en modo ro
+    READ_REPLICA_ENABLED = os.getenv('READ_REPLICA_ENABLED', 'false') == 'true'
+    SQLALCHEMY_REPLICA_URI = os.getenv('DATABASE_REPLICA_URL')
+    READ_YOUR_WRITES_SECONDS = float(os.getenv('READ_YOUR_WRITES_SECONDS', 5))
+
+    # PRAGMAs aplicados a cada conexión SQLite. WAL permite lecturas durante
+    # las escrituras y busy_timeout espera al lock en vez de fallar
+    SQLITE_TUNING = os.getenv('SQLITE_TUNING', 'true') == 'true'
+    SQLITE_PRAGMAS = {
+        'journal_mode': os.getenv('SQLITE_JOURNAL_MODE', 'WAL'),
+        'synchronous': os.getenv('SQLITE_SYNCHRONOUS', 'NORMAL'),
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        # Negativo: tamaño en KiB. 8 MiB por conexión: 3 workers con hasta
+        # DB_POOL_SIZE + DB_MAX_OVERFLOW conexiones (más réplica y async)
+        # deben caber en la VM de 1 GB. Las lecturas van por mmap, que
+        # comparte el page cache del sistema entre todos los procesos
+        'cache_size': int(os.getenv('SQLITE_CACHE_SIZE', -8 * 1024)),
+        'temp_store': 'MEMORY',
+    }
+
     JWT_SECRET_KEY = os.getenv('JWT_SECRET_KEY', 'jwt_secret')
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # Cada cuánto refresca cada worker la lista de admins
+    ROLE_CHANGES_REFRESH_SECONDS = int(
+        os.getenv('ROLE_CHANGES_REFRESH_SECONDS', 30))
+
+    # Método de werkzeug con su factor de trabajo y procesos dedicados al hash
+    PASSWORD_HASH_METHOD = os.getenv('PASSWORD_HASH_METHOD', 'scrypt:32768:8:1')
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', 1))
+
+    # Instrumentación de consultas SQL por petición (Server-Timing y logs)
+    SQL_INSTRUMENTATION = os.getenv('SQL_INSTRUMENTATION', 'true') == 'true'
+    SQL_STATS_LOG = os.getenv('SQL_STATS_LOG', 'false') == 'true'
+    # Máximo de consultas por endpoint; en testing superarlo devuelve 500
+    SQL_QUERY_BUDGETS = {
+        'products.get_products': 3,
+        'products.get_product': 3,
+        'products.search_products': 3,
+        'categories.get_categories': 3,
+        'categories.get_category': 3,
+        'categories.get_category_by_slug': 3,
+        'categories.get_category_products': 3,
+        'orders.get_user_orders': 3,
+        'orders.get_order': 3,
+    }
+
+    # Documentación Swagger en /docs y /apispec.json. API_SPEC_FILE es la
+    # spec generada con `flask apispec` al construir la imagen
+    API_DOCS_ENABLED = os.getenv('API_DOCS_ENABLED', 'true') == 'true'
+    API_SPEC_FILE = os.getenv('API_SPEC_FILE', os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'apispec.json'))
+
+    # Modo ASGI (app.asgi): hilos para las rutas que no tienen vista async
+    ASGI_WSGI_THREADS = int(os.getenv('ASGI_WSGI_THREADS', 10))
+
+    # 'orjson' (si está instalado) o 'std' para el encoder de la librería estándar
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson')
+
+    # /health/ready devuelve 503 si el SELECT 1 tarda más que esto
+    READINESS_MAX_DB_LATENCY_MS = float(
+        os.getenv('READINESS_MAX_DB_LATENCY_MS', 250))
+
+    # Caché en memoria de respuestas del catálogo (por worker); 0 la desactiva
+    CATALOG_CACHE_MAX_BYTES = int(
+        os.getenv('CATALOG_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+    CATALOG_CACHE_TTL = int(os.getenv('CATALOG_CACHE_TTL', 300))
+
+    # Respuestas guardadas por Idempotency-Key en POST /orders y cada cuánto
+    # se borran las caducadas (0 desactiva el barrido)
+    IDEMPOTENCY_TTL_SECONDS = int(os.getenv('IDEMPOTENCY_TTL_SECONDS', 24 * 3600))
+    IDEMPOTENCY_SWEEP_SECONDS = float(os.getenv('IDEMPOTENCY_SWEEP_SECONDS', 3600))
+
+    # Cola de trabajos de pedidos (worker.py). Sin workers que la consuman
+    # (RUN_JOB_WORKERS en gunicorn o worker.py aparte con JOB_QUEUE_ENABLED)
+    # las rutas no encolan nada
+    JOB_QUEUE_ENABLED = os.getenv(
+        'JOB_QUEUE_ENABLED', os.getenv('RUN_JOB_WORKERS', 'false')) == 'true'
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_POLL_SECONDS = float(os.getenv('JOB_POLL_SECONDS', 1))
+    # Un trabajo 'running' sin terminar tras este tiempo se vuelve a reservar
+    JOB_LOCK_TIMEOUT_SECONDS = float(os.getenv('JOB_LOCK_TIMEOUT_SECONDS', 300))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 5))
+    # Los trabajos 'failed' se guardan para revisarlos y luego se borran
+    JOB_FAILED_RETENTION_SECONDS = float(
+        os.getenv('JOB_FAILED_RETENTION_SECONDS', 7 * 24 * 3600))
+    # Pasa los pedidos nuevos a 'processing' desde la cola
+    ORDER_AUTO_PROCESS = os.getenv('ORDER_AUTO_PROCESS', 'false') == 'true'
+    LOW_STOCK_THRESHOLD = int(os.getenv('LOW_STOCK_THRESHOLD', 5))
+
+    # Filas por transacción en POST /products/bulk
+    BULK_IMPORT_BATCH_SIZE = int(os.getenv('BULK_IMPORT_BATCH_SIZE', 500))
+    # Máximo de ajustes por petición en PUT /products/stock
+    BULK_STOCK_MAX_ITEMS = int(os.getenv('BULK_STOCK_MAX_ITEMS', 10000))
+    # Filas por lectura del cursor en las exportaciones CSV/NDJSON
+    EXPORT_BATCH_SIZE = int(os.getenv('EXPORT_BATCH_SIZE', 1000))
 
 
 class DevelopmentConfig(Config):
@@ -2,9 +2,25 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from flask_cors import CORS
+from app.utils.admins import AdminList
+from app.utils.async_db import AsyncDatabase
+from app.utils.cache import ResponseCache
+from app.utils.idempotency import IdempotencySweeper
+from app.utils.metrics import Metrics
+from app.utils.passwords import PasswordHasher
+from app.utils.query_stats import QueryInstrumentation
+from app.utils.read_replica import ReadReplica, RoutingSession
 
 
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 jwt = JWTManager()
 cors = CORS()
+catalog_cache = ResponseCache()
+admins = AdminList()
+password_hasher = PasswordHasher()
+query_stats = QueryInstrumentation()
+metrics = Metrics()
+read_replica = ReadReplica()
+idempotency_sweeper = IdempotencySweeper()
+async_db = AsyncDatabase()
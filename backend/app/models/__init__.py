@@ -3,3 +3,7 @@ from app.models.category import Category
 from app.models.product import Product
 from app.models.order import Order
 from app.models.order_item import OrderItem
+from app.models.catalog_version import CatalogVersion
+from app.models.idempotency_key import IdempotencyKey
+from app.models.job import Job
+from app.models.sales_aggregate import ProductSalesDaily, OrderStatusDaily
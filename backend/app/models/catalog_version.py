@@ -0,0 +1,53 @@
+from app.extensions import db, catalog_cache
+from datetime import datetime, timezone
+from sqlalchemy import select, update
+
+
+class CatalogVersion(db.Model):
+    """
+    Contador de cambios por tabla del catálogo. Cada escritura sobre
+    productos o categorías incrementa su versión en la misma transacción,
+    lo que permite derivar ETags sin leer las tablas del catálogo.
+    """
+    __tablename__ = 'catalog_versions'
+
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def bump(cls, *names: str) -> None:
+        """Incrementa la versión de las tablas indicadas (sin hacer commit)."""
+        result = db.session.execute(
+            update(cls)
+            .where(cls.name.in_(names))
+            .values(version=cls.version + 1,
+                    updated_at=datetime.now(timezone.utc))
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != len(names):
+            existing = set(db.session.scalars(
+                select(cls.name).where(cls.name.in_(names))))
+            db.session.add_all(cls(name=name, version=1)
+                               for name in names if name not in existing)
+
+        catalog_cache.invalidate(*names)
+
+    @classmethod
+    def current(cls, *names: str) -> list[tuple[str, int, datetime | None]]:
+        """(name, version, updated_at) de las tablas indicadas en una consulta."""
+        return cls.from_rows(names, db.session.execute(cls.select_current(*names)).all())
+
+    @classmethod
+    def select_current(cls, *names: str):
+        """SELECT de current(), para ejecutarlo también con una AsyncSession."""
+        return select(cls.name, cls.version, cls.updated_at).where(cls.name.in_(names))
+
+    @staticmethod
+    def from_rows(names, rows) -> list[tuple[str, int, datetime | None]]:
+        found = {row.name: tuple(row) for row in rows}
+        return [found.get(name, (name, 0, None)) for name in names]
+
+    def __repr__(self) -> str:
+        return f"<CatalogVersion {self.name}: {self.version}>"
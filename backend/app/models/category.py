@@ -1,6 +1,6 @@
 from app.extensions import db
 from slugify import slugify
-from sqlalchemy import event
+from sqlalchemy import event, func
 
 
 class Category(db.Model):
@@ -13,18 +13,33 @@ class Category(db.Model):
 
     products = db.relationship('Product', backref='category', lazy=True)
 
-    def to_dict(self) -> dict:
+    @classmethod
+    def query_with_product_count(cls):
+        """
+        Query de (Category, product_count) que cuenta los productos de todas
+        las categorías con un único GROUP BY en lugar de un COUNT por fila.
+        """
         from app.models.product import Product
-        product_count = db.session.query(
-            Product).filter_by(category_id=self.id).count()
-
-        return {
+        counts = db.session.query(
+            Product.category_id,
+            func.count(Product.id).label('product_count')
+        ).group_by(Product.category_id).subquery()
+
+        return db.session.query(
+            cls, func.coalesce(counts.c.product_count, 0)
+        ).outerjoin(counts, counts.c.category_id == cls.id)
+
+    def to_dict(self, product_count: int | None = None) -> dict:
+        """product_count viene de query_with_product_count; sin él se omite."""
+        data: dict = {
             'id': self.id,
             'name': self.name,
             'slug': self.slug,
             'description': self.description,
-            'product_count': product_count
         }
+        if product_count is not None:
+            data['product_count'] = product_count
+        return data
 
     def __repr__(self) -> str:
         return f"<Category {self.id}: {self.name}>"
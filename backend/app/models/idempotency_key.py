@@ -0,0 +1,50 @@
+from app.extensions import db
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, select
+
+
+class IdempotencyKey(db.Model):
+    """
+    Respuesta guardada de una petición con cabecera Idempotency-Key, para
+    que los reintentos del cliente la reciban sin volver a ejecutarse.
+    """
+    __tablename__ = 'idempotency_keys'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    key = db.Column(db.String(255), primary_key=True)
+    request_hash = db.Column(db.String(64), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    response = db.Column(db.Text, nullable=False)
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
+
+    @classmethod
+    def lookup(cls, user_id: int, key: str) -> 'IdempotencyKey | None':
+        """Clave vigente del usuario, por clave primaria en una consulta."""
+        return db.session.scalar(
+            select(cls).where(cls.user_id == user_id, cls.key == key,
+                              cls.expires_at > datetime.now(timezone.utc)))
+
+    @classmethod
+    def store(cls, user_id: int, key: str, request_hash: str,
+              status_code: int, response: str, ttl_seconds: float) -> None:
+        """
+        Guarda la respuesta en la transacción en curso (sin hacer commit),
+        sustituyendo una clave caducada que aún no se haya barrido.
+        """
+        db.session.execute(
+            delete(cls).where(cls.user_id == user_id, cls.key == key,
+                              cls.expires_at <= datetime.now(timezone.utc)))
+        db.session.add(cls(
+            user_id=user_id, key=key, request_hash=request_hash,
+            status_code=status_code, response=response,
+            expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds)))
+
+    @classmethod
+    def delete_expired(cls) -> int:
+        """Borra las claves caducadas (sin hacer commit) y devuelve cuántas."""
+        result = db.session.execute(
+            delete(cls).where(cls.expires_at <= datetime.now(timezone.utc)))
+        return result.rowcount
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey {self.key}: User {self.user_id}>"
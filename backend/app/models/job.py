@@ -0,0 +1,61 @@
+from app.extensions import db
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import delete
+import json
+
+
+class Job(db.Model):
+    """
+    Trabajo pendiente de la cola local. Se inserta en la misma transacción
+    que el cambio que lo origina, así que sobrevive a reinicios y nunca se
+    encola trabajo de una transacción que acabó en rollback.
+    """
+    __tablename__ = 'jobs'
+    __table_args__ = (
+        db.Index('ix_jobs_status_run_at', 'status', 'run_at'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')
+    # pending -> running -> (borrado) | pending (reintento) | failed (se
+    # borra tras JOB_FAILED_RETENTION_SECONDS)
+    status = db.Column(db.String(20), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    run_at = db.Column(db.DateTime, nullable=False,
+                       default=lambda: datetime.now(timezone.utc))
+    locked_at = db.Column(db.DateTime)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(
+        db.DateTime, default=lambda: datetime.now(timezone.utc))
+
+    @classmethod
+    def enqueue(cls, kind: str, payload: dict | None = None,
+                delay_seconds: float = 0) -> 'Job | None':
+        """
+        Añade el trabajo a la sesión (sin hacer commit). Sin workers que
+        consuman la cola (JOB_QUEUE_ENABLED) no encola nada: la tabla solo
+        crecería.
+        """
+        if not current_app.config['JOB_QUEUE_ENABLED']:
+            return None
+        job = cls(kind=kind, payload=json.dumps(payload or {}),
+                  run_at=datetime.now(timezone.utc) + timedelta(seconds=delay_seconds))
+        db.session.add(job)
+        return job
+
+    @classmethod
+    def delete_failed(cls, retention_seconds: float) -> int:
+        """
+        Borra los trabajos 'failed' de hace más de retention_seconds (sin
+        hacer commit) y devuelve cuántos. Los que terminan bien ya se borran
+        al acabar.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=retention_seconds)
+        result = db.session.execute(
+            delete(cls).where(cls.status == 'failed', cls.run_at <= cutoff))
+        return result.rowcount
+
+    def __repr__(self) -> str:
+        return f"<Job {self.id}: {self.kind} ({self.status})>"
@@ -1,9 +1,12 @@
 from app.extensions import db
 from datetime import datetime, timezone
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
 
 
 class Order(db.Model):
     __tablename__ = 'orders'
+    STATUSES = ('pending', 'processing', 'shipped', 'delivered', 'cancelled')
 
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -15,18 +18,32 @@ class Order(db.Model):
     items = db.relationship('OrderItem', backref='order',
                             lazy=True, cascade='all, delete-orphan')
 
-    def to_dict(self) -> dict:
+    @classmethod
+    def query_with_items(cls):
+        """
+        Carga los pedidos junto con sus items y productos en dos consultas
+        (SELECT ... IN) en lugar de una por pedido y otra por item.
+        """
+        return cls.query.options(*cls._items_loader())
+
+    @classmethod
+    def select_with_items(cls):
+        """Como query_with_items() pero como select(), válido con AsyncSession."""
+        return select(cls).options(*cls._items_loader())
+
+    @classmethod
+    def _items_loader(cls) -> tuple:
         from app.models.order_item import OrderItem
+        return (selectinload(cls.items).joinedload(OrderItem.product),)
 
-        items = OrderItem.query.filter_by(order_id=self.id).all()
-
+    def to_dict(self) -> dict:
         return {
             'id': self.id,
             'user_id': self.user_id,
             'total': self.total,
             'status': self.status,
             'created_at': self.created_at.isoformat(),
-            'items': [item.to_dict() for item in items]
+            'items': [item.to_dict() for item in self.items]
         }
 
     def __repr__(self) -> str:
@@ -15,13 +15,13 @@ class OrderItem(db.Model):
     product = db.relationship('Product')
 
     def to_dict(self) -> dict:
-        from app.models.product import Product
-
-        product = Product.query.get(self.product_id)
+        product = self.product
         return {
             'id': self.id,
             'order_id': self.order_id,
             'product_id': self.product_id,
+            'product_name': product.name if product else None,
+            'product_image_url': product.image_url if product else None,
             'quantity': self.quantity,
             'price': self.price,
             'subtotal': self.quantity * self.price
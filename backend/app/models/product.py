@@ -1,9 +1,17 @@
+import re
 from app.extensions import db
 from datetime import datetime, timezone
+from sqlalchemy import Float, Integer, event, func, literal_column, text
 
 
 class Product(db.Model):
     __tablename__ = 'products'
+    __table_args__ = (
+        # Índices para la paginación por cursor (created_at, id) del listado
+        db.Index('ix_products_created_at_id', 'created_at', 'id'),
+        db.Index('ix_products_category_id_created_at_id',
+                 'category_id', 'created_at', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -15,6 +23,35 @@ class Product(db.Model):
     created_at = db.Column(
         db.DateTime, default=lambda: datetime.now(timezone.utc))
 
+    @classmethod
+    def search_query(cls, q: str):
+        """
+        Query de productos que coinciden con todos los términos de q (con
+        prefijo), ordenada por relevancia. Usa la tabla FTS5 products_fts en
+        SQLite y la columna search_vector en Postgres; ver la migración
+        c61b8e3f2a97. Devuelve None si q no contiene términos buscables.
+        """
+        terms: list[str] = re.findall(r'\w+', q.lower())
+        if not terms:
+            return None
+
+        if db.engine.dialect.name == 'postgresql':
+            tsquery = func.to_tsquery(
+                'simple', ' & '.join(f'{term}:*' for term in terms))
+            vector = literal_column('products.search_vector')
+            return cls.query.filter(vector.op('@@')(tsquery)) \
+                .order_by(func.ts_rank(vector, tsquery).desc(), cls.id)
+
+        # bm25 es menor cuanto más relevante; el nombre pesa 10 veces más
+        matches = text(
+            "SELECT rowid AS id, bm25(products_fts, 10.0, 1.0) AS rank "
+            "FROM products_fts WHERE products_fts MATCH :match"
+        ).columns(id=Integer, rank=Float).subquery()
+        match: str = ' '.join(f'"{term}"*' for term in terms)
+
+        return cls.query.join(matches, matches.c.id == cls.id) \
+            .params(match=match).order_by(matches.c.rank, cls.id)
+
     def to_dict(self) -> dict:
         return {
             'id': self.id,
@@ -29,3 +66,62 @@ class Product(db.Model):
 
     def __repr__(self) -> str:
         return f"<Product {self.id}: {self.name} - ${self.price}>"
+
+
+# Índice de búsqueda para las bases creadas con db.create_all() (desarrollo
+# sin migraciones). Es el mismo SQL que la migración c61b8e3f2a97: las
+# migraciones no importan código de la app, así que se mantiene duplicado
+SEARCH_DDL: dict[str, list[str]] = {
+    'sqlite': [
+        """
+        CREATE VIRTUAL TABLE products_fts USING fts5(
+            name, description,
+            content='products', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+        )
+        """,
+        """
+        CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+        """,
+        """
+        CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+        END
+        """,
+        """
+        CREATE TRIGGER products_fts_au AFTER UPDATE OF name, description ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, description)
+            VALUES ('delete', old.id, old.name, old.description);
+            INSERT INTO products_fts(rowid, name, description)
+            VALUES (new.id, new.name, new.description);
+        END
+        """,
+    ],
+    'postgresql': [
+        """
+        ALTER TABLE products ADD COLUMN search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('simple', coalesce(name, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+        ) STORED
+        """,
+        "CREATE INDEX ix_products_search_vector ON products USING GIN (search_vector)",
+    ],
+}
+
+
+@event.listens_for(Product.__table__, 'after_create')
+def create_search_index(target, connection, **kw) -> None:
+    for statement in SEARCH_DDL.get(connection.dialect.name, []):
+        connection.execute(text(statement))
+
+
+@event.listens_for(Product.__table__, 'before_drop')
+def drop_search_index(target, connection, **kw) -> None:
+    # Los triggers caen con products, la tabla FTS no
+    if connection.dialect.name == 'sqlite':
+        connection.execute(text('DROP TABLE IF EXISTS products_fts'))
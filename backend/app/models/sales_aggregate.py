@@ -0,0 +1,68 @@
+from app.extensions import db
+from datetime import date
+from sqlalchemy.dialects import postgresql, sqlite
+
+
+class ProductSalesDaily(db.Model):
+    """
+    Ventas por producto y día de creación del pedido, sin contar los
+    pedidos cancelados. Las rutas de pedidos la mantienen en la misma
+    transacción que el pedido; ver app/utils/sales.py.
+    """
+    __tablename__ = 'sales_product_daily'
+    COUNTERS = ('orders', 'units', 'revenue')
+
+    day = db.Column(db.Date, primary_key=True)
+    product_id = db.Column(db.Integer, db.ForeignKey('products.id'),
+                           primary_key=True)
+    # Pedidos que incluyen el producto
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    units = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    @classmethod
+    def add(cls, day: date, deltas: dict[int, dict]) -> None:
+        """Suma deltas ({product_id: {contador: valor}}) a las filas del día."""
+        _increment(cls, day, 'product_id', deltas)
+
+    def __repr__(self) -> str:
+        return f"<ProductSalesDaily {self.day} {self.product_id}: {self.units}>"
+
+
+class OrderStatusDaily(db.Model):
+    """
+    Pedidos e importe por estado actual y día de creación: el embudo de
+    pedidos. Un cambio de estado mueve el pedido de una fila a otra.
+    """
+    __tablename__ = 'sales_status_daily'
+    COUNTERS = ('orders', 'revenue')
+
+    day = db.Column(db.Date, primary_key=True)
+    status = db.Column(db.String(50), primary_key=True)
+    orders = db.Column(db.Integer, nullable=False, default=0)
+    revenue = db.Column(db.Float, nullable=False, default=0)
+
+    @classmethod
+    def add(cls, day: date, deltas: dict[str, dict]) -> None:
+        """Suma deltas ({status: {contador: valor}}) a las filas del día."""
+        _increment(cls, day, 'status', deltas)
+
+    def __repr__(self) -> str:
+        return f"<OrderStatusDaily {self.day} {self.status}: {self.orders}>"
+
+
+def _increment(model, day: date, key: str, deltas: dict) -> None:
+    """
+    Suma los contadores a las filas (day, key) con un único INSERT ... ON
+    CONFLICT DO UPDATE (SQLite >= 3.24 y Postgres), sin hacer commit. Un
+    SELECT previo seguido de INSERT fallaría con IntegrityError cuando dos
+    pedidos crean a la vez la misma fila.
+    """
+    table = model.__table__
+    dialect = postgresql if db.engine.dialect.name == 'postgresql' else sqlite
+    stmt = dialect.insert(table)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.day, table.c[key]],
+        set_={name: table.c[name] + stmt.excluded[name] for name in model.COUNTERS})
+    db.session.execute(stmt, [{'day': day, key: value, **counters}
+                              for value, counters in deltas.items()])
@@ -1,5 +1,5 @@
-from app.extensions import db
-from werkzeug.security import generate_password_hash, check_password_hash
+from app.extensions import db, admins, password_hasher
+from sqlalchemy import event
 from datetime import datetime, timezone
 
 
@@ -15,10 +15,13 @@ class User(db.Model):
         db.DateTime, default=lambda: datetime.now(timezone.utc))
 
     def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+        self.password_hash = password_hasher.hash(password)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        return password_hasher.verify(self.password_hash, password)
+
+    def password_needs_rehash(self) -> bool:
+        return password_hasher.needs_rehash(self.password_hash)
 
     def to_dict(self) -> dict:
         return {
@@ -31,3 +34,15 @@ class User(db.Model):
 
     def __repr__(self) -> str:
         return f"<User {self.id}: {self.username} ({self.email})>"
+
+
+@event.listens_for(User.role, 'set')
+def track_role_change(target, value, oldvalue, initiator):
+    """Deja de fiarse del claim 'role' en este worker en cuanto deja de ser admin."""
+    if target.id is not None and value != 'admin':
+        admins.discard(target.id)
+
+
+@event.listens_for(User, 'after_delete')
+def track_user_delete(mapper, connection, target):
+    admins.discard(target.id)
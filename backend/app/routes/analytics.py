@@ -0,0 +1,360 @@
+import click
+from flask import Blueprint, request, jsonify, Response
+from flask_jwt_extended import jwt_required
+from app.extensions import db
+from app.models.category import Category
+from app.models.order import Order
+from app.models.product import Product
+from app.models.sales_aggregate import OrderStatusDaily, ProductSalesDaily
+from app.utils.decorators import admin_required, read_replica
+from app.utils.pagination import parse_limit
+from app.utils.sales import in_range, parse_date_range, rebuild_aggregates
+from sqlalchemy import func, select
+from typing import Tuple
+
+bp = Blueprint('analytics', __name__, url_prefix='/analytics')
+
+# Todas las consultas leen las tablas sales_*, nunca orders ni order_items.
+# Las filas que quedan a cero tras cancelar pedidos se descartan con HAVING
+
+GROUPINGS = ('day', 'category', 'product')
+
+
+@bp.route('/revenue', methods=['GET'])
+@jwt_required()
+@admin_required()
+@read_replica()
+def get_revenue() -> Tuple[Response, int]:
+    """
+    Revenue and units sold (admin)
+    ---
+    tags:
+      - Analytics
+    security:
+      - Bearer: []
+    description: >
+      Revenue and units of non-cancelled orders grouped by order creation
+      day (UTC), category or product. orders counts orders per day, or the
+      orders that include each product; it is omitted per category.
+    parameters:
+      - in: query
+        name: group_by
+        schema:
+          type: string
+          enum: [day, category, product]
+          default: day
+        required: false
+        description: Grouping
+      - in: query
+        name: from
+        schema:
+          type: string
+          format: date
+        required: false
+        description: First day included
+        example: "2025-10-01"
+      - in: query
+        name: to
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Last day included
+        example: "2025-10-31"
+    responses:
+      200:
+        description: One row per group
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  day:
+                    type: string
+                    format: date
+                    example: "2025-10-20"
+                  orders:
+                    type: integer
+                    example: 12
+                  units:
+                    type: integer
+                    example: 30
+                  revenue:
+                    type: number
+                    format: float
+                    example: 1499.7
+      400:
+        description: Invalid grouping or date range
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "from debe ser una fecha YYYY-MM-DD"
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    group_by: str = request.args.get('group_by', 'day')
+    if group_by not in GROUPINGS:
+        return jsonify({'error': f'group_by inválido. Valores permitidos: {", ".join(GROUPINGS)}'}), 400
+
+    try:
+        since, until = parse_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    sales = ProductSalesDaily
+    units = func.sum(sales.units).label('units')
+    revenue = func.sum(sales.revenue).label('revenue')
+
+    if group_by == 'day':
+        orders: dict = dict(db.session.execute(in_range(
+            select(OrderStatusDaily.day, func.sum(OrderStatusDaily.orders))
+            .where(OrderStatusDaily.status != 'cancelled')
+            .group_by(OrderStatusDaily.day),
+            OrderStatusDaily.day, since, until)).all())
+        stmt = select(sales.day, units, revenue).group_by(sales.day) \
+            .having(func.sum(sales.orders) > 0).order_by(sales.day)
+        rows = [{'day': day, 'orders': orders.get(day, 0), 'units': units,
+                 'revenue': round(revenue, 2)}
+                for day, units, revenue in db.session.execute(
+                    in_range(stmt, sales.day, since, until))]
+
+    elif group_by == 'category':
+        stmt = (
+            select(Product.category_id, Category.name, units, revenue)
+            .join(Product, Product.id == sales.product_id)
+            .outerjoin(Category, Category.id == Product.category_id)
+            .group_by(Product.category_id, Category.name)
+            .having(func.sum(sales.orders) > 0)
+            .order_by(revenue.desc())
+        )
+        rows = [{'category_id': category_id, 'category_name': name,
+                 'units': units, 'revenue': round(revenue, 2)}
+                for category_id, name, units, revenue in db.session.execute(
+                    in_range(stmt, sales.day, since, until))]
+
+    else:
+        rows = _product_rows(since, until, revenue.desc())
+
+    return jsonify(rows), 200
+
+
+@bp.route('/top-products', methods=['GET'])
+@jwt_required()
+@admin_required()
+@read_replica()
+def get_top_products() -> Tuple[Response, int]:
+    """
+    Best-selling products (admin)
+    ---
+    tags:
+      - Analytics
+    security:
+      - Bearer: []
+    parameters:
+      - in: query
+        name: by
+        schema:
+          type: string
+          enum: [revenue, units]
+          default: revenue
+        required: false
+        description: Ranking criterion
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          default: 20
+          maximum: 100
+        required: false
+        description: Number of products
+      - in: query
+        name: from
+        schema:
+          type: string
+          format: date
+        required: false
+        description: First day included
+      - in: query
+        name: to
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Last day included
+    responses:
+      200:
+        description: Products ordered by the chosen criterion
+        content:
+          application/json:
+            schema:
+              type: array
+              items:
+                type: object
+                properties:
+                  product_id:
+                    type: integer
+                    example: 1
+                  product_name:
+                    type: string
+                    example: "Laptop HP Pavilion"
+                  orders:
+                    type: integer
+                    example: 8
+                  units:
+                    type: integer
+                    example: 10
+                  revenue:
+                    type: number
+                    format: float
+                    example: 7499.9
+      400:
+        description: Invalid parameters
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "by debe ser revenue o units"
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    by: str = request.args.get('by', 'revenue')
+    if by not in ('revenue', 'units'):
+        return jsonify({'error': 'by debe ser revenue o units'}), 400
+
+    try:
+        limit: int = parse_limit(request.args.get('limit'))
+        since, until = parse_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    order_by = func.sum(getattr(ProductSalesDaily, by)).desc()
+    return jsonify(_product_rows(since, until, order_by, limit)), 200
+
+
+def _product_rows(since, until, order_by, limit: int | None = None) -> list[dict]:
+    sales = ProductSalesDaily
+    stmt = (
+        select(sales.product_id, Product.name, func.sum(sales.orders),
+               func.sum(sales.units), func.sum(sales.revenue))
+        .outerjoin(Product, Product.id == sales.product_id)
+        .group_by(sales.product_id, Product.name)
+        .having(func.sum(sales.orders) > 0)
+        .order_by(order_by, sales.product_id)
+        .limit(limit)
+    )
+    return [{'product_id': product_id, 'product_name': name, 'orders': orders,
+             'units': units, 'revenue': round(revenue, 2)}
+            for product_id, name, orders, units, revenue in db.session.execute(
+                in_range(stmt, sales.day, since, until))]
+
+
+@bp.route('/funnel', methods=['GET'])
+@jwt_required()
+@admin_required()
+@read_replica()
+def get_funnel() -> Tuple[Response, int]:
+    """
+    Orders by current status (admin)
+    ---
+    tags:
+      - Analytics
+    security:
+      - Bearer: []
+    description: >
+      Orders created in the range grouped by their current status, with
+      the share of the total.
+    parameters:
+      - in: query
+        name: from
+        schema:
+          type: string
+          format: date
+        required: false
+        description: First day included
+      - in: query
+        name: to
+        schema:
+          type: string
+          format: date
+        required: false
+        description: Last day included
+    responses:
+      200:
+        description: Status funnel
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                total_orders:
+                  type: integer
+                  example: 40
+                statuses:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      status:
+                        type: string
+                        example: "delivered"
+                      orders:
+                        type: integer
+                        example: 25
+                      revenue:
+                        type: number
+                        format: float
+                        example: 3120.5
+                      share:
+                        type: number
+                        format: float
+                        example: 0.625
+      400:
+        description: Invalid date range
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    try:
+        since, until = parse_date_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = select(OrderStatusDaily.status, func.sum(OrderStatusDaily.orders),
+                  func.sum(OrderStatusDaily.revenue)) \
+        .group_by(OrderStatusDaily.status)
+    found: dict = {status: (orders, revenue) for status, orders, revenue in
+                   db.session.execute(in_range(stmt, OrderStatusDaily.day, since, until))}
+
+    total: int = sum(orders for orders, _ in found.values())
+    statuses = [*Order.STATUSES, *sorted(set(found) - set(Order.STATUSES))]
+    return jsonify({
+        'total_orders': total,
+        'statuses': [{
+            'status': status,
+            'orders': found.get(status, (0, 0))[0],
+            'revenue': round(found.get(status, (0, 0))[1], 2),
+            'share': round(found[status][0] / total, 4) if total and status in found else 0,
+        } for status in statuses]
+    }), 200
+
+
+@bp.cli.command('rebuild')
+def rebuild() -> None:
+    """Recalculate the sales tables from orders and order_items."""
+    rebuild_aggregates()
+    db.session.commit()
+    click.echo('Sales aggregates rebuilt')
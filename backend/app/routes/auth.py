@@ -2,11 +2,20 @@ from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.user import User
+from app.utils.decorators import async_view, read_replica
+from app.utils.passwords import PasswordHashTimeout
+from sqlalchemy import select
 from typing import Tuple
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
 
+@bp.errorhandler(PasswordHashTimeout)
+def password_hash_timeout(e: PasswordHashTimeout) -> Tuple[Response, int]:
+    # Pool de hash saturado: el cliente puede reintentar
+    return jsonify({'error': 'Servicio ocupado, inténtalo de nuevo en unos segundos'}), 503
+
+
 @bp.route('/register', methods=['POST'])
 def register() -> Tuple[Response, int]:
     """
@@ -118,7 +127,7 @@ def register() -> Tuple[Response, int]:
     db.session.add(user)
     db.session.commit()
 
-    access_token = create_access_token(identity=str(user.id))
+    access_token = _create_token(user)
 
     return jsonify({
         'message': 'Usuario creado exitosamente',
@@ -220,7 +229,12 @@ def login() -> Tuple[Response, int]:
     if not user or not user.check_password(data['password']):
         return jsonify({'error': 'La contraseña introducida no es correcta'}), 401
 
-    access_token = create_access_token(identity=str(user.id))
+    # Si cambió el método o el coste del hash, se regenera con la contraseña en claro
+    if user.password_needs_rehash():
+        user.set_password(data['password'])
+        db.session.commit()
+
+    access_token = _create_token(user)
 
     return jsonify({
         'message': 'Usuario identificado correctamente',
@@ -231,6 +245,7 @@ def login() -> Tuple[Response, int]:
 
 @bp.route('/me', methods=['GET'])
 @jwt_required()
+@read_replica()
 def get_current_user() -> Tuple[Response, int]:
     """
     Get current authenticated user information
@@ -286,10 +301,29 @@ def get_current_user() -> Tuple[Response, int]:
                   type: string
                   example: "Usuario no encontrado"
     """
+    return _current_user_response(db.session.scalar(_current_user_statement()))
+
+
+@async_view('auth.get_current_user', jwt=True, replica_reads=True)
+async def get_current_user_async(session) -> Tuple[Response, int]:
+    """get_current_user para el modo ASGI, con la misma consulta."""
+    return _current_user_response(await session.scalar(_current_user_statement()))
+
+
+# Consulta y respuesta compartidas por la vista síncrona y la async
+def _current_user_statement():
     user_id: int = int(get_jwt_identity())
-    user: User | None = User.query.get(user_id)
+    return select(User).where(User.id == user_id)
+
 
+def _current_user_response(user: User | None) -> Tuple[Response, int]:
     if not user:
         return jsonify({'error': 'Usuario no encontrado'}), 404
 
     return jsonify(user.to_dict()), 200
+
+
+def _create_token(user: User) -> str:
+    # El rol viaja como claim para que admin_required no consulte la base de datos
+    return create_access_token(identity=str(user.id),
+                               additional_claims={'role': user.role})
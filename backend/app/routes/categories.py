@@ -1,9 +1,11 @@
 from flask import Blueprint, request, jsonify, Response
 from flask_jwt_extended import jwt_required
-from app.utils.decorators import admin_required
+from app.utils.decorators import admin_required, catalog_conditional, read_replica
 from app.extensions import db
 from app.models.category import Category
+from app.models.catalog_version import CatalogVersion
 from app.models.product import Product
+from app.utils.serialization import row_dicts
 from typing import Tuple
 
 
@@ -11,6 +13,8 @@ bp = Blueprint('categories', __name__, url_prefix='/categories')
 
 
 @bp.route('/', methods=['GET'])
+@read_replica()
+@catalog_conditional('categories', 'products')
 def get_categories() -> Tuple[Response, int]:
     """
     Get all categories
@@ -43,12 +47,17 @@ def get_categories() -> Tuple[Response, int]:
                     type: integer
                     description: "Número de productos en esta categoría"
                     example: 5
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
-    categories: list[Category] = Category.query.all()
-    return jsonify([category.to_dict() for category in categories]), 200
+    rows: list[tuple[Category, int]] = Category.query_with_product_count() \
+        .order_by(Category.id).all()
+    return jsonify([category.to_dict(count) for category, count in rows]), 200
 
 
 @bp.route('/<int:id>', methods=['GET'])
+@read_replica()
+@catalog_conditional('categories', 'products')
 def get_category(id: int) -> Tuple[Response, int]:
     """
     Get a specific category by ID
@@ -97,16 +106,22 @@ def get_category(id: int) -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Categoria con id 1 no encontrada"
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
-    category: Category | None = Category.query.get(id)
+    row: tuple[Category, int] | None = Category.query_with_product_count() \
+        .filter(Category.id == id).first()
 
-    if not category:
+    if not row:
         return jsonify({'error': f'Categoria con id {id} no encontrada'}), 404
 
-    return jsonify(category.to_dict()), 200
+    category, count = row
+    return jsonify(category.to_dict(count)), 200
 
 
 @bp.route('/slug/<string:slug>', methods=['GET'])
+@read_replica()
+@catalog_conditional('categories', 'products')
 def get_category_by_slug(slug: str) -> Tuple[Response, int]:
     """
     Get a specific category by slug
@@ -155,16 +170,22 @@ def get_category_by_slug(slug: str) -> Tuple[Response, int]:
                 message:
                   type: string
                   example: "Categoría no encontrada"
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
-    category: Category | None = Category.query.filter_by(slug=slug).first()
+    row: tuple[Category, int] | None = Category.query_with_product_count() \
+        .filter(Category.slug == slug).first()
 
-    if not category:
+    if not row:
         return jsonify({'message': 'Categoría no encontrada'}), 404
 
-    return jsonify(category.to_dict()), 200
+    category, count = row
+    return jsonify(category.to_dict(count)), 200
 
 
 @bp.route('/<int:id>/products', methods=['GET'])
+@read_replica()
+@catalog_conditional('categories', 'products')
 def get_category_products(id: int) -> Tuple[Response, int]:
     """
     Get all products in a specific category
@@ -226,15 +247,18 @@ def get_category_products(id: int) -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Categoria con id 1 no encontrada"
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
     category: Category | None = Category.query.get(id)
 
     if not category:
         return jsonify({'error': f'Categoria con id {id} no encontrada'}), 404
 
-    products: list[Product] = Product.query.filter_by(category_id=id).all()
+    products: list[dict] = row_dicts(
+        Product.query.filter_by(category_id=id), Product)
 
-    return jsonify([product.to_dict() for product in products]), 200
+    return jsonify(products), 200
 
 
 @bp.route('/', methods=['POST'])
@@ -355,11 +379,13 @@ def create_category() -> Tuple[Response, int]:
     )
 
     db.session.add(category)
+    CatalogVersion.bump('categories')
     db.session.commit()
 
     return jsonify({
         'message': 'Categoria creada correctamente',
-        'category': category.to_dict()
+        # Recién creada: todavía no tiene productos
+        'category': category.to_dict(product_count=0)
     }), 201
 
 
@@ -498,11 +524,15 @@ def update_category(id: int) -> Tuple[Response, int]:
     if 'description' in data:
         category.description = data['description']
 
+    CatalogVersion.bump('categories')
     db.session.commit()
 
+    _, count = Category.query_with_product_count() \
+        .filter(Category.id == id).one()
+
     return jsonify({
         'message': 'Categoria actualizada correctamente',
-        'category': category.to_dict()
+        'category': category.to_dict(count)
     }), 200
 
 
@@ -589,6 +619,7 @@ def delete_category(id: int) -> Tuple[Response, int]:
         }), 400
 
     db.session.delete(category)
+    CatalogVersion.bump('categories')
     db.session.commit()
 
     return jsonify({'message': 'Categoria eliminada correctamente'}), 200
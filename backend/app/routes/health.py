@@ -1,4 +1,11 @@
-from flask import Blueprint, jsonify
+import os
+import time
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from flask import Blueprint, current_app, jsonify
+from sqlalchemy import text
+from app.extensions import catalog_cache, db
+from app.utils.metrics import render_metrics
 
 bp = Blueprint('health', __name__)
 
@@ -8,22 +15,126 @@ def health():
     """Health check endpoint for monitoring"""
     return jsonify({
         'status': 'healthy',
-        'message': 'DevMart Backend is running'
+        'message': 'DevMart Backend is running',
+        'catalog_cache': catalog_cache.stats()
     }), 200
 
 
+@bp.route('/health/ready', methods=['GET'])
+def ready():
+    """
+    Readiness probe: timed database round trip, pool saturation and
+    migration state. Returns 503 when the machine should stop receiving
+    traffic. A schema behind the migration head is only reported as a
+    warning
+    """
+    problems: list[str] = []
+    warnings: list[str] = []
+    database: dict = {}
+
+    # Con el pool agotado, connect() esperaría pool_timeout (30 s), mucho más
+    # que el timeout del check en fly.toml: se responde sin conectar
+    pool = _pool_status()
+    if pool.get('exhausted'):
+        problems.append('connection pool exhausted')
+        return jsonify({'status': 'unavailable', 'problems': problems,
+                        'database': database, 'pool': pool}), 503
+
+    try:
+        start = time.perf_counter()
+        with db.engine.connect() as connection:
+            connection.execute(text('SELECT 1'))
+            database['current_revision'] = _current_revisions(connection)
+        database['latency_ms'] = round((time.perf_counter() - start) * 1000, 2)
+    except Exception as e:
+        problems.append(f'database: {e.__class__.__name__}')
+        return jsonify({'status': 'unavailable', 'problems': problems,
+                        'database': database}), 503
+
+    max_latency: float = current_app.config['READINESS_MAX_DB_LATENCY_MS']
+    if database['latency_ms'] > max_latency:
+        problems.append(f'database latency above {max_latency} ms')
+
+    # Sin release_command (en fly.io la máquina de release no monta el
+    # volumen de SQLite) las migraciones se aplican a mano: sacar de
+    # rotación la única máquina hasta entonces dejaría la API caída
+    try:
+        database['head_revision'] = _head_revisions()
+    except Exception as e:
+        warnings.append(f'migrations: {e.__class__.__name__}')
+    else:
+        if database['current_revision'] != database['head_revision']:
+            warnings.append('database schema is not at the migration head')
+
+    return jsonify({
+        'status': 'unavailable' if problems else 'ready',
+        'problems': problems,
+        'warnings': warnings,
+        'database': database,
+        'pool': pool
+    }), 503 if problems else 200
+
+
+@bp.route('/metrics', methods=['GET'])
+def metrics():
+    """Prometheus metrics aggregated across all gunicorn workers"""
+    return render_metrics()
+
+
 @bp.route('/', methods=['GET'])
 def index():
     """Root endpoint"""
+    endpoints: dict[str, str] = {
+        'health': '/health',
+        'readiness': '/health/ready',
+        'metrics': '/metrics',
+        'docs': '/docs',
+        'categories': '/categories',
+        'products': '/products',
+        'auth': '/auth'
+    }
+    if not current_app.config['API_DOCS_ENABLED']:
+        del endpoints['docs']
+
     return jsonify({
         'name': 'DevMart API',
         'version': '1.0.0',
         'status': 'operational',
-        'endpoints': {
-            'health': '/health',
-            'docs': '/docs',
-            'categories': '/categories',
-            'products': '/products',
-            'auth': '/auth'
-        }
+        'endpoints': endpoints
     }), 200
+
+
+_head_revision_cache: list[str] | None = None
+
+
+def _head_revisions() -> list[str]:
+    # Los scripts de migración no cambian en caliente: se leen una vez
+    global _head_revision_cache
+    if _head_revision_cache is None:
+        # El directorio de Flask-Migrate es relativo al cwd ('migrations')
+        directory: str = os.path.join(os.path.dirname(current_app.root_path),
+                                      current_app.extensions['migrate'].directory)
+        _head_revision_cache = sorted(ScriptDirectory(directory).get_heads())
+    return _head_revision_cache
+
+
+def _current_revisions(connection) -> list[str]:
+    return sorted(MigrationContext.configure(connection).get_current_heads())
+
+
+def _pool_status() -> dict:
+    pool = db.engine.pool
+    if not hasattr(pool, 'checkedout'):
+        return {'class': type(pool).__name__}
+
+    size: int = pool.size()
+    checked_out: int = pool.checkedout()
+    overflow: int = pool.overflow()
+    max_overflow: int = getattr(pool, '_max_overflow', 0)
+    return {
+        'class': type(pool).__name__,
+        'size': size,
+        'checked_out': checked_out,
+        'overflow': overflow,
+        'exhausted': max_overflow >= 0 and checked_out >= size + max_overflow
+    }
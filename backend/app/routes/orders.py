@@ -1,9 +1,19 @@
-from flask import Blueprint, request, jsonify, Response
+from flask import Blueprint, current_app, request, jsonify, Response
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.extensions import db
 from app.models.order import Order
 from app.models.order_item import OrderItem
 from app.models.product import Product
+from app.models.catalog_version import CatalogVersion
+from app.models.idempotency_key import IdempotencyKey
+from app.models.job import Job
+from app.utils.decorators import admin_required, async_view, read_replica
+from app.utils.export import EXPORT_FORMATS, export_response, parse_id_range
+from app.utils.idempotency import MAX_KEY_LENGTH, request_fingerprint
+from app.utils.metrics import ORDER_EVENTS
+from app.utils.sales import record_order_created, record_status_change
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
 from typing import Tuple
 
 bp = Blueprint('orders', __name__, url_prefix='/orders')
@@ -11,6 +21,7 @@ bp = Blueprint('orders', __name__, url_prefix='/orders')
 
 @bp.route('/', methods=['GET'])
 @jwt_required()
+@read_replica()
 def get_user_orders() -> Tuple[Response, int]:
     """
     Get all orders for the authenticated user
@@ -58,6 +69,12 @@ def get_user_orders() -> Tuple[Response, int]:
                         product_id:
                           type: integer
                           example: 1
+                        product_name:
+                          type: string
+                          example: "Laptop HP Pavilion"
+                        product_image_url:
+                          type: string
+                          example: "https://example.com/images/laptop.jpg"
                         quantity:
                           type: integer
                           example: 2
@@ -80,16 +97,119 @@ def get_user_orders() -> Tuple[Response, int]:
                   type: string
                   example: "Missing Authorization Header"
     """
+    return _user_orders_response(db.session.scalars(_user_orders_statement()).all())
+
+
+@async_view('orders.get_user_orders', jwt=True, replica_reads=True)
+async def get_user_orders_async(session) -> Tuple[Response, int]:
+    """get_user_orders para el modo ASGI, con las mismas consultas."""
+    return _user_orders_response((await session.scalars(_user_orders_statement())).all())
+
+
+# Consulta y respuesta compartidas por la vista síncrona y la async
+def _user_orders_statement():
     user_id: int = int(get_jwt_identity())
+    return Order.select_with_items().where(Order.user_id == user_id) \
+        .order_by(Order.created_at.desc())
 
-    orders: list[Order] = Order.query.filter_by(
-        user_id=user_id).order_by(Order.created_at.desc()).all()
 
+def _user_orders_response(orders: list[Order]) -> Tuple[Response, int]:
     return jsonify([order.to_dict() for order in orders]), 200
 
 
+@bp.route('/export', methods=['GET'])
+@jwt_required()
+@admin_required()
+@read_replica()
+def export_orders() -> Response | Tuple[Response, int]:
+    """
+    Export all orders (admin)
+    ---
+    tags:
+      - Orders
+    security:
+      - Bearer: []
+    description: >
+      Streams one row per order item, ordered by order id, as CSV (with
+      header) or NDJSON using a chunked response. The id range applies to
+      order ids; to resume, pass the last order_id received completely as
+      after_id.
+    parameters:
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [csv, ndjson]
+          default: csv
+        required: false
+        description: Output format
+      - in: query
+        name: after_id
+        schema:
+          type: integer
+        required: false
+        description: Only export ids greater than this (resume after the last id received)
+      - in: query
+        name: until_id
+        schema:
+          type: integer
+        required: false
+        description: Only export ids up to and including this one
+    responses:
+      200:
+        description: Order lines
+        content:
+          text/csv:
+            schema:
+              type: string
+              example: "order_id,user_id,status,total,created_at,item_id,product_id,quantity,price"
+          application/x-ndjson:
+            schema:
+              type: string
+              example: '{"order_id": 1, "user_id": 2, "status": "pending", "item_id": 1, "quantity": 2}'
+      400:
+        description: Invalid format or id range
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Formato no soportado, use csv o ndjson"
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    fmt: str = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Formato no soportado, use csv o ndjson'}), 400
+
+    try:
+        after_id, until_id = parse_id_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = (
+        select(
+            Order.id.label('order_id'), Order.user_id, Order.status,
+            Order.total, Order.created_at, OrderItem.id.label('item_id'),
+            OrderItem.product_id, OrderItem.quantity, OrderItem.price)
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .order_by(Order.id, OrderItem.id)
+    )
+    if after_id is not None:
+        stmt = stmt.where(Order.id > after_id)
+    if until_id is not None:
+        stmt = stmt.where(Order.id <= until_id)
+
+    return export_response(stmt, fmt, 'orders')
+
+
 @bp.route('/<int:id>', methods=['GET'])
 @jwt_required()
+@read_replica()
 def get_order(id: int) -> Tuple[Response, int]:
     """
     Get a specific order by ID
@@ -143,6 +263,12 @@ def get_order(id: int) -> Tuple[Response, int]:
                       product_id:
                         type: integer
                         example: 1
+                      product_name:
+                        type: string
+                        example: "Laptop HP Pavilion"
+                      product_image_url:
+                        type: string
+                        example: "https://example.com/images/laptop.jpg"
                       quantity:
                         type: integer
                         example: 2
@@ -186,7 +312,8 @@ def get_order(id: int) -> Tuple[Response, int]:
                   example: "No se encontro ese pedido"
     """
     user_id: int = int(get_jwt_identity())
-    order: Order | None = Order.query.get(id)
+    order: Order | None = Order.query_with_items() \
+        .filter(Order.id == id).first()
 
     if not order:
         return jsonify({'error': 'No se encontro ese pedido'}), 404
@@ -207,6 +334,18 @@ def create_order() -> Tuple[Response, int]:
       - Orders
     security:
       - Bearer: []
+    parameters:
+      - in: header
+        name: Idempotency-Key
+        schema:
+          type: string
+          maxLength: 255
+        required: false
+        description: >
+          Client-generated key. Retrying with the same key and body returns
+          the stored response (with Idempotent-Replayed header) instead of
+          creating another order
+        example: "3f2b8c1e-5a4d-4e8b-9c1a-2d7e6f0a9b3c"
     requestBody:
       required: true
       description: Order data
@@ -300,6 +439,26 @@ def create_order() -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Producto con id 1 no encontrado"
+      409:
+        description: Stock was taken by a concurrent order, nothing was reserved
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Stock insuficiente para el producto Laptop HP Pavilion"
+      422:
+        description: Idempotency-Key already used with a different body
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "La Idempotency-Key ya se usó con otro pedido"
       500:
         description: Internal server error
         content:
@@ -314,35 +473,59 @@ def create_order() -> Tuple[Response, int]:
     user_id: int = int(get_jwt_identity())
     data: dict = request.get_json()
 
+    idempotency_key: str | None = request.headers.get('Idempotency-Key')
+    if idempotency_key is not None:
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            return jsonify({'error': 'Idempotency-Key inválida'}), 400
+
+        request_hash: str = request_fingerprint(data)
+        stored: IdempotencyKey | None = IdempotencyKey.lookup(user_id, idempotency_key)
+        if stored:
+            return _replay(stored, request_hash)
+
     if not data or not data.get('items') or len(data['items']) == 0:
         return jsonify({'error': 'El pedido debe tener mínimo un producto'}), 400
 
-    total: float = 0
-    validated_items: list[dict] = []
+    requested: dict[int, int] = {}
+    lines: list[tuple[int, int]] = []
 
     for item in data['items']:
         if not item.get('product_id') or 'quantity' not in item:
             return jsonify({'error': 'Cada item debe tener product_id y quantity'}), 400
 
+        # Los productos se buscan en un dict por id entero: "3" también vale,
+        # pero no 1.9 ni True, que int() convertiría en 1
+        product_id = item['product_id']
+        if isinstance(product_id, str) and product_id.isascii() and product_id.isdigit():
+            product_id = int(product_id)
+        elif not isinstance(product_id, int) or isinstance(product_id, bool):
+            return jsonify({'error': 'product_id debe ser un número entero'}), 400
+
         quantity = item['quantity']
 
         if not isinstance(quantity, int) or quantity <= 0:
             return jsonify({'error': 'La cantidad debe ser un número entero mayor a 0'}), 400
 
-        product: Product | None = Product.query.get(item['product_id'])
+        lines.append((product_id, quantity))
+        requested[product_id] = requested.get(product_id, 0) + quantity
+
+    # Una sola consulta IN para todos los productos del pedido
+    products: dict[int, Product] = {
+        product.id: product for product in
+        Product.query.filter(Product.id.in_(requested.keys())).all()
+    }
+
+    total: float = 0
+
+    for product_id, quantity in requested.items():
+        product: Product | None = products.get(product_id)
 
         if not product:
-            return jsonify({'error': f"Producto con id {item['product_id']} no encontrado"}), 404
+            return jsonify({'error': f"Producto con id {product_id} no encontrado"}), 404
 
         if product.stock < quantity:
             return jsonify({'error': f'Stock insuficiente para el producto {product.name}. Disponible: {product.stock}, solicitado: {quantity}'}), 400
 
-        validated_items.append({
-            'product': product,
-            'quantity': quantity,
-            'price': product.price
-        })
-
         total += product.price * quantity
 
     try:
@@ -355,29 +538,77 @@ def create_order() -> Tuple[Response, int]:
         db.session.add(order)
         db.session.flush()
 
-        for item in validated_items:
-            order_item: OrderItem = OrderItem(
+        for product_id, quantity in lines:
+            db.session.add(OrderItem(
                 order_id=order.id,
-                product_id=item['product'].id,
-                quantity=item['quantity'],
-                price=item['price']
+                product_id=product_id,
+                quantity=quantity,
+                price=products[product_id].price
+            ))
+
+        # Descuento atómico: solo se aplica si sigue habiendo stock, de modo
+        # que dos pedidos concurrentes no pueden vender la misma unidad
+        for product_id, quantity in requested.items():
+            result = db.session.execute(
+                update(Product)
+                .where(Product.id == product_id, Product.stock >= quantity)
+                .values(stock=Product.stock - quantity)
+                .execution_options(synchronize_session=False)
             )
-            db.session.add(order_item)
-
-            item['product'].stock -= item['quantity']
+            if result.rowcount != 1:
+                db.session.rollback()
+                return jsonify({'error': f'Stock insuficiente para el producto {products[product_id].name}'}), 409
 
-        db.session.commit()
+        record_order_created(order, {
+            product_id: (quantity, products[product_id].price * quantity)
+            for product_id, quantity in requested.items()
+        })
 
-        return jsonify({
+        body: dict = {
             'message': 'Pedido creado correctamente',
             'order': order.to_dict()
-        }), 201
+        }
+
+        # La respuesta se guarda en la misma transacción que el pedido: si
+        # un reintento concurrente ya la guardó, el commit falla y se
+        # devuelve la suya sin crear un segundo pedido
+        if idempotency_key is not None:
+            IdempotencyKey.store(
+                user_id, idempotency_key, request_hash, 201,
+                current_app.json.dumps(body),
+                current_app.config['IDEMPOTENCY_TTL_SECONDS'])
+
+        Job.enqueue('order.created', {'order_id': order.id})
+        CatalogVersion.bump('products')
+        db.session.commit()
+        ORDER_EVENTS.labels('created').inc()
+
+        return jsonify(body), 201
+
+    except IntegrityError:
+        db.session.rollback()
+        stored = IdempotencyKey.lookup(user_id, idempotency_key) \
+            if idempotency_key is not None else None
+        if stored:
+            return _replay(stored, request_hash)
+        return jsonify({'error': 'Error al crear el pedido'}), 500
 
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': 'Error al crear el pedido'}), 500
 
 
+def _replay(stored: IdempotencyKey, request_hash: str) -> Tuple[Response, int]:
+    """Respuesta guardada para una Idempotency-Key ya usada."""
+    if stored.request_hash != request_hash:
+        return jsonify({'error': 'La Idempotency-Key ya se usó con otro pedido'}), 422
+
+    response: Response = current_app.response_class(
+        stored.response, mimetype='application/json')
+    response.headers['Idempotent-Replayed'] = 'true'
+    return response, stored.status_code
+
+
 @bp.route('/<int:id>/status', methods=['PUT'])
 @jwt_required()
 def update_order_status(id: int) -> Tuple[Response, int]:
@@ -472,6 +703,16 @@ def update_order_status(id: int) -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Pedido no encontrado"
+      409:
+        description: Order status was changed concurrently
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "El estado del pedido cambió mientras se actualizaba"
     """
     order: Order | None = Order.query.get(id)
 
@@ -483,13 +724,31 @@ def update_order_status(id: int) -> Tuple[Response, int]:
     if not data or not data.get('status'):
         return jsonify({'error': 'El campo status es requerido'}), 400
 
-    valid_statuses: list[str] = ['pending', 'processing',
-                                 'shipped', 'delivered', 'cancelled']
+    valid_statuses: list[str] = list(Order.STATUSES)
     if data['status'] not in valid_statuses:
         return jsonify({'error': f'Estado inválido. Valores permitidos: {", ".join(valid_statuses)}'}), 400
 
-    order.status = data['status']
-    db.session.commit()
+    old_status: str = order.status
+    new_status: str = data['status']
+    if old_status != new_status:
+        # Condicional sobre el estado leído: si el worker u otra petición lo
+        # cambió entretanto, los agregados de ventas registrarían una
+        # transición que no ocurrió
+        result = db.session.execute(
+            update(Order)
+            .where(Order.id == order.id, Order.status == old_status)
+            .values(status=new_status)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
+            db.session.rollback()
+            return jsonify({'error': 'El estado del pedido cambió mientras se actualizaba'}), 409
+
+        record_status_change(order, old_status, new_status)
+        Job.enqueue('order.status_changed',
+                    {'order_id': order.id, 'status': new_status})
+        db.session.commit()
+        ORDER_EVENTS.labels('status_changed').inc()
 
     return jsonify({
         'message': 'Estado del pedido actualizado',
@@ -566,6 +825,16 @@ def cancel_order(id: int) -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Pedido no encontrado"
+      409:
+        description: Order was modified concurrently
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "El pedido ya no está pendiente"
     """
     user_id: int = int(get_jwt_identity())
 
@@ -580,14 +849,32 @@ def cancel_order(id: int) -> Tuple[Response, int]:
     if order.status != 'pending':
         return jsonify({'error': f'No se puede cancelar un pedido en estado "{order.status}"'}), 400
 
+    # La transición pending -> cancelled es condicional para que dos
+    # cancelaciones simultáneas no restauren el stock dos veces
+    result = db.session.execute(
+        update(Order)
+        .where(Order.id == order.id, Order.status == 'pending')
+        .values(status='cancelled')
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        db.session.rollback()
+        return jsonify({'error': 'El pedido ya no está pendiente'}), 409
+
     order_items: list[OrderItem] = OrderItem.query.filter_by(
         order_id=order.id).all()
     for item in order_items:
-        product: Product | None = Product.query.get(item.product_id)
-        if product:
-            product.stock += item.quantity
+        db.session.execute(
+            update(Product)
+            .where(Product.id == item.product_id)
+            .values(stock=Product.stock + item.quantity)
+            .execution_options(synchronize_session=False)
+        )
 
-    order.status = 'cancelled'
+    record_status_change(order, 'pending', 'cancelled')
+    Job.enqueue('order.cancelled', {'order_id': order.id})
+    CatalogVersion.bump('products')
     db.session.commit()
+    ORDER_EVENTS.labels('cancelled').inc()
 
     return jsonify({'message': 'Pedido cancelado y stock restaurado'}), 200
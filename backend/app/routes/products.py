@@ -1,24 +1,82 @@
-from flask import Blueprint, request, jsonify, Response
+import asyncio
+from flask import Blueprint, current_app, request, jsonify, Response
 from flask_jwt_extended import jwt_required
-from app.utils.decorators import admin_required
+from app.utils.decorators import admin_required, async_view, catalog_conditional, read_replica
 from app.extensions import db
 from app.models.product import Product
 from app.models.category import Category
+from app.models.catalog_version import CatalogVersion
+from app.utils.product_import import import_products, iter_records
+from app.utils.export import EXPORT_FORMATS, export_response, parse_id_range
+from app.utils.pagination import decode_cursor, encode_cursor, parse_limit
+from app.utils.serialization import row_dicts
+from app.utils.stock_sync import apply_adjustments, parse_adjustments
+from sqlalchemy import Select, select, tuple_
 from typing import Tuple
 
 bp = Blueprint('products', __name__, url_prefix='/products')
 
 
 @bp.route('/', methods=['GET'])
+@read_replica()
+@catalog_conditional('products')
 def get_products() -> Tuple[Response, int]:
     """
     Get all products
     ---
     tags:
       - Products
+    parameters:
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          minimum: 1
+          maximum: 100
+        required: false
+        description: Page size. Enables cursor pagination (max 100)
+        example: 20
+      - in: query
+        name: cursor
+        schema:
+          type: string
+        required: false
+        description: Opaque cursor returned as next_cursor by the previous page
+      - in: query
+        name: category_id
+        schema:
+          type: integer
+        required: false
+        description: Only products of this category
+        example: 1
+      - in: query
+        name: min_price
+        schema:
+          type: number
+          format: float
+        required: false
+        description: Minimum price (inclusive)
+        example: 10
+      - in: query
+        name: max_price
+        schema:
+          type: number
+          format: float
+        required: false
+        description: Maximum price (inclusive)
+        example: 1000
+      - in: query
+        name: in_stock
+        schema:
+          type: boolean
+        required: false
+        description: Only products with stock > 0
+        example: true
     responses:
       200:
-        description: List of all products
+        description: >
+          List of all products. When limit or cursor is given the response is
+          a page object {items, next_cursor} ordered by newest first
         content:
           application/json:
             schema:
@@ -53,12 +111,283 @@ def get_products() -> Tuple[Response, int]:
                     type: string
                     format: date-time
                     example: "2025-10-20T10:30:00.000000"
+      400:
+        description: Invalid filter or pagination parameters
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Cursor inválido"
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
-    products: list[Product] = Product.query.all()
-    return jsonify([product.to_dict() for product in products]), 200
+    try:
+        stmt, paginated, limit = _products_statement()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    return _products_page(db.session.execute(stmt).mappings().all(), paginated, limit)
+
+
+@async_view('products.get_products', replica_reads=True, catalog_tables=('products',))
+async def get_products_async(session) -> Tuple[Response, int]:
+    """get_products para el modo ASGI, con las mismas consultas."""
+    try:
+        stmt, paginated, limit = _products_statement()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    result = await session.execute(stmt)
+    # Sin paginar son miles de filas: convertirlas y serializarlas en el
+    # event loop lo bloquearía decenas de ms. to_thread copia el request
+    # context (contextvars), así que jsonify funciona en el hilo
+    return await asyncio.to_thread(_products_page, result.mappings(), paginated, limit)
+
+
+def _products_statement() -> tuple[Select, bool, int]:
+    """
+    SELECT de las columnas de products según los filtros y el cursor del
+    query string, si la respuesta va paginada y el tamaño de página. Lanza
+    ValueError si algún parámetro no es válido.
+    """
+    args = request.args
+    category_id: int | None = _number_arg('category_id', int)
+    min_price: float | None = _number_arg('min_price', float)
+    max_price: float | None = _number_arg('max_price', float)
+    paginated: bool = 'limit' in args or 'cursor' in args
+    limit: int = parse_limit(args.get('limit'))
+    cursor = decode_cursor(args['cursor']) if args.get('cursor') else None
+
+    stmt = select(*Product.__table__.columns)
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if min_price is not None:
+        stmt = stmt.where(Product.price >= min_price)
+    if max_price is not None:
+        stmt = stmt.where(Product.price <= max_price)
+    if args.get('in_stock', '').lower() in ('1', 'true', 'yes'):
+        stmt = stmt.where(Product.stock > 0)
+
+    if not paginated:
+        return stmt, paginated, limit
+
+    if cursor:
+        stmt = stmt.where(tuple_(Product.created_at, Product.id) < cursor)
+
+    # Se pide una fila extra para saber si existe una página siguiente
+    stmt = stmt.order_by(Product.created_at.desc(), Product.id.desc()).limit(limit + 1)
+    return stmt, paginated, limit
+
+
+def _products_page(rows, paginated: bool, limit: int) -> Tuple[Response, int]:
+    products: list[dict] = [dict(row) for row in rows]
+    if not paginated:
+        return jsonify(products), 200
+
+    next_cursor: str | None = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_cursor = encode_cursor(
+            products[-1]['created_at'], products[-1]['id'])
+
+    return jsonify({
+        'items': products,
+        'next_cursor': next_cursor
+    }), 200
+
+
+@bp.route('/search', methods=['GET'])
+@read_replica()
+@catalog_conditional('products')
+def search_products() -> Tuple[Response, int]:
+    """
+    Full-text search over product name and description
+    ---
+    tags:
+      - Products
+    parameters:
+      - in: query
+        name: q
+        schema:
+          type: string
+        required: true
+        description: Search terms. Every term must match, as a prefix
+        example: "lapt hp"
+      - in: query
+        name: limit
+        schema:
+          type: integer
+          minimum: 1
+          maximum: 100
+        required: false
+        description: Page size (max 100)
+        example: 20
+      - in: query
+        name: offset
+        schema:
+          type: integer
+          minimum: 0
+        required: false
+        description: Number of results to skip, as returned in next_offset
+        example: 0
+    responses:
+      200:
+        description: Matching products ordered by relevance
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                items:
+                  type: array
+                  items:
+                    type: object
+                    properties:
+                      id:
+                        type: integer
+                        example: 1
+                      name:
+                        type: string
+                        example: "Laptop HP Pavilion"
+                      price:
+                        type: number
+                        format: float
+                        example: 899.99
+                next_offset:
+                  type: integer
+                  nullable: true
+                  example: 20
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
+      400:
+        description: Missing search terms or invalid pagination parameters
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "El parámetro q es requerido"
+    """
+    q: str = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'El parámetro q es requerido'}), 400
+
+    try:
+        limit: int = parse_limit(request.args.get('limit'))
+        offset: int = _number_arg('offset', int) or 0
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    if offset < 0:
+        return jsonify({'error': 'offset no puede ser negativo'}), 400
+
+    query = Product.search_query(q)
+    if query is None:
+        return jsonify({'items': [], 'next_offset': None}), 200
+
+    products: list[dict] = row_dicts(
+        query.limit(limit + 1).offset(offset), Product)
+
+    next_offset: int | None = None
+    if len(products) > limit:
+        products = products[:limit]
+        next_offset = offset + limit
+
+    return jsonify({'items': products, 'next_offset': next_offset}), 200
+
+
+def _number_arg(name: str, cast: type) -> int | float | None:
+    value: str | None = request.args.get(name)
+    if value is None:
+        return None
+    try:
+        return cast(value)
+    except ValueError as e:
+        raise ValueError(f'{name} debe ser un número') from e
+
+
+@bp.route('/export', methods=['GET'])
+@read_replica()
+def export_products() -> Response | Tuple[Response, int]:
+    """
+    Export the product catalog
+    ---
+    tags:
+      - Products
+    description: >
+      Streams every product ordered by id as CSV (with header) or NDJSON
+      using a chunked response. Pass the last id received as after_id to
+      resume an interrupted export.
+    parameters:
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [csv, ndjson]
+          default: csv
+        required: false
+        description: Output format
+      - in: query
+        name: after_id
+        schema:
+          type: integer
+        required: false
+        description: Only export ids greater than this (resume after the last id received)
+      - in: query
+        name: until_id
+        schema:
+          type: integer
+        required: false
+        description: Only export ids up to and including this one
+    responses:
+      200:
+        description: Product feed
+        content:
+          text/csv:
+            schema:
+              type: string
+              example: "id,name,description,price,stock,image_url,category_id,created_at"
+          application/x-ndjson:
+            schema:
+              type: string
+              example: '{"id": 1, "name": "Laptop HP Pavilion", "price": 899.99}'
+      400:
+        description: Invalid format or id range
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Formato no soportado, use csv o ndjson"
+    """
+    fmt: str = request.args.get('format', 'csv')
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': 'Formato no soportado, use csv o ndjson'}), 400
+
+    try:
+        after_id, until_id = parse_id_range()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    stmt = select(*Product.__table__.columns).order_by(Product.id)
+    if after_id is not None:
+        stmt = stmt.where(Product.id > after_id)
+    if until_id is not None:
+        stmt = stmt.where(Product.id <= until_id)
+
+    return export_response(stmt, fmt, 'products')
 
 
 @bp.route('/<int:id>', methods=['GET'])
+@read_replica()
+@catalog_conditional('products')
 def get_product(id: int) -> Tuple[Response, int]:
     """
     Get a specific product by ID
@@ -118,6 +447,8 @@ def get_product(id: int) -> Tuple[Response, int]:
                 error:
                   type: string
                   example: "Producto no encontrado"
+      304:
+        description: Not modified (matching If-None-Match or If-Modified-Since)
     """
     product: Product | None = Product.query.get(id)
 
@@ -281,6 +612,7 @@ def create_product() -> Tuple[Response, int]:
     )
 
     db.session.add(product)
+    CatalogVersion.bump('products')
     db.session.commit()
 
     return jsonify({
@@ -289,6 +621,216 @@ def create_product() -> Tuple[Response, int]:
     }), 201
 
 
+@bp.route('/bulk', methods=['POST'])
+@jwt_required()
+@admin_required()
+def bulk_import_products() -> Tuple[Response, int]:
+    """
+    Bulk import products from CSV or NDJSON
+    ---
+    tags:
+      - Products
+    security:
+      - Bearer: []
+    description: >
+      Streams the request body (or the uploaded "file" field) row by row.
+      Rows without id create a product; rows with id update the given
+      columns of that product. Rows are written in batches, each batch in
+      its own transaction, so valid rows are kept even if others fail.
+    parameters:
+      - in: query
+        name: format
+        schema:
+          type: string
+          enum: [csv, ndjson]
+        required: false
+        description: Input format. Defaults to the request Content-Type
+    requestBody:
+      required: true
+      content:
+        text/csv:
+          schema:
+            type: string
+            example: "name,price,stock,category_id\nTeclado,49.9,10,1"
+        application/x-ndjson:
+          schema:
+            type: string
+            example: '{"name": "Teclado", "price": 49.9, "stock": 10}'
+        multipart/form-data:
+          schema:
+            type: object
+            properties:
+              file:
+                type: string
+                format: binary
+    responses:
+      200:
+        description: Import finished (check failed/errors for rejected rows)
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                message:
+                  type: string
+                  example: "Importación finalizada"
+                created:
+                  type: integer
+                  example: 120
+                updated:
+                  type: integer
+                  example: 5
+                failed:
+                  type: integer
+                  example: 1
+                errors:
+                  type: array
+                  description: First 1000 rejected rows (1-based, header excluded)
+                  items:
+                    type: object
+                    properties:
+                      row:
+                        type: integer
+                        example: 7
+                      error:
+                        type: string
+                        example: "price debe ser mayor a 0"
+      400:
+        description: Unsupported format or missing body
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Formato no soportado, use csv o ndjson"
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    upload = request.files.get('file')
+    stream = upload.stream if upload else request.stream
+
+    fmt = request.args.get('format')
+    if fmt is None:
+        mimetype = (upload.mimetype if upload else request.mimetype) or ''
+        filename = (upload.filename or '') if upload else ''
+        if mimetype == 'text/csv' or filename.endswith('.csv'):
+            fmt = 'csv'
+        elif mimetype in ('application/x-ndjson', 'application/jsonl') \
+                or filename.endswith(('.ndjson', '.jsonl')):
+            fmt = 'ndjson'
+
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': 'Formato no soportado, use csv o ndjson'}), 400
+
+    summary = import_products(
+        iter_records(stream, fmt), current_app.config['BULK_IMPORT_BATCH_SIZE'])
+
+    return jsonify({'message': 'Importación finalizada', **summary}), 200
+
+
+@bp.route('/stock', methods=['PUT'])
+@jwt_required()
+@admin_required()
+def bulk_update_stock() -> Tuple[Response, int]:
+    """
+    Bulk stock adjustment
+    ---
+    tags:
+      - Products
+    security:
+      - Bearer: []
+    description: >
+      Applies all adjustments in a single transaction. Each item either
+      sets the stock ({id, stock}) or adds to it ({id, delta}); deltas
+      never take the stock below 0. Repeated ids are applied in order.
+    requestBody:
+      required: true
+      content:
+        application/json:
+          schema:
+            type: object
+            required:
+              - items
+            properties:
+              items:
+                type: array
+                maxItems: 10000
+                items:
+                  type: object
+                  required:
+                    - id
+                  properties:
+                    id:
+                      type: integer
+                      example: 1
+                    stock:
+                      type: integer
+                      minimum: 0
+                      example: 25
+                    delta:
+                      type: integer
+                      example: -3
+    responses:
+      200:
+        description: Stock updated
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                message:
+                  type: string
+                  example: "Stock actualizado correctamente"
+                updated:
+                  type: integer
+                  example: 2
+                not_found:
+                  type: array
+                  items:
+                    type: integer
+                  example: [9999]
+      400:
+        description: Invalid adjustments
+        content:
+          application/json:
+            schema:
+              type: object
+              properties:
+                error:
+                  type: string
+                  example: "Ajuste 0: se requiere id y solo uno de stock o delta"
+      401:
+        description: Authentication required
+      403:
+        description: Admin permission required
+    """
+    data: dict | None = request.get_json(silent=True)
+    items = data.get('items') if isinstance(data, dict) else None
+
+    if isinstance(items, list) and len(items) > current_app.config['BULK_STOCK_MAX_ITEMS']:
+        return jsonify({'error': 'Demasiados ajustes en una sola petición'}), 400
+
+    try:
+        adjustments = parse_adjustments(items)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    updated, not_found = apply_adjustments(adjustments)
+    if updated:
+        CatalogVersion.bump('products')
+    db.session.commit()
+
+    return jsonify({
+        'message': 'Stock actualizado correctamente',
+        'updated': updated,
+        'not_found': not_found
+    }), 200
+
+
 @bp.route('/<int:id>', methods=['PUT'])
 @jwt_required()
 @admin_required()
@@ -431,6 +973,7 @@ def update_product(id: int) -> Tuple[Response, int]:
     if 'category_id' in data:
         product.category_id = data['category_id']
 
+    CatalogVersion.bump('products')
     db.session.commit()
 
     return jsonify({
@@ -506,6 +1049,7 @@ def delete_product(id: int) -> Tuple[Response, int]:
         return jsonify({'error': f'No se encontro el producto con id {id}'}), 404
 
     db.session.delete(product)
+    CatalogVersion.bump('products')
     db.session.commit()
 
     return jsonify({'message': 'Producto eliminado correctamente'}), 200
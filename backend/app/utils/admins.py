@@ -0,0 +1,50 @@
+import threading
+import time
+
+from flask import Flask
+
+
+class AdminList:
+    """
+    Ids de los usuarios que hoy son admin según la base de datos, cacheados
+    en memoria y recargados como mucho cada refresh_seconds. admin_required
+    se fía del claim 'role' del token solo si el usuario sigue en la lista,
+    de modo que una degradación o un borrado hecho con SQL directo (no hay
+    endpoint para cambiar roles) retira el acceso en ese plazo y no al
+    caducar el token. Los admins son pocos: la consulta es barata.
+    """
+
+    def __init__(self, refresh_seconds: float = 30) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._ids: frozenset[int] = frozenset()
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.refresh_seconds = app.config.get('ROLE_CHANGES_REFRESH_SECONDS', 30)
+        self._ids = frozenset()
+        self._loaded_at = 0.0
+
+    def discard(self, user_id: int) -> None:
+        """Retira al usuario en este worker sin esperar al refresco."""
+        with self._lock:
+            self._ids = self._ids - {user_id}
+
+    def __contains__(self, user_id: int) -> bool:
+        self._refresh()
+        return user_id in self._ids
+
+    def _refresh(self) -> None:
+        if time.monotonic() - self._loaded_at < self.refresh_seconds:
+            return
+
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self.refresh_seconds:
+                return
+
+            from app.extensions import db
+            from app.models.user import User
+            # Se sustituye entera: lo que ya no está en la base de datos se pierde
+            self._ids = frozenset(db.session.scalars(
+                db.select(User.id).where(User.role == 'admin')))
+            self._loaded_at = time.monotonic()
@@ -0,0 +1,124 @@
+import io
+import sys
+
+from a2wsgi import WSGIMiddleware
+from flask import Flask, Response
+from werkzeug.exceptions import HTTPException
+
+from app.extensions import async_db, password_hasher
+from app.utils.decorators import ASYNC_VIEWS
+
+
+class AsgiApp:
+    """
+    Adaptador ASGI de la app Flask. Los GET con vista registrada con
+    async_view (listado de productos, pedidos del usuario, /auth/me) se
+    ejecutan en el event loop con una AsyncSession, de modo que esperar a la
+    base de datos no ocupa un hilo. El resto de rutas se delegan a la app
+    WSGI en un pool de ASGI_WSGI_THREADS hilos.
+
+    Las vistas async corren dentro de un request context normal de Flask y
+    pasan por los before/after_request de la app (CORS, métricas,
+    Server-Timing), así que las respuestas son idénticas a las del modo WSGI.
+
+    Esos hooks y la validación del JWT se ejecutan en el propio event loop:
+    solo tocan memoria (contadores de métricas, caché del catálogo, decodificar
+    y comprobar la firma HMAC del token) y no hacen E/S, por lo que cuestan
+    microsegundos. Ninguna vista async usa admin_required, que sí consulta la
+    base de datos. Lo que pesa es serializar listados grandes: las vistas lo
+    mandan a un hilo con asyncio.to_thread (ver get_products_async).
+    """
+
+    def __init__(self, app: Flask) -> None:
+        self.app = app
+        self.wsgi = WSGIMiddleware(app, workers=app.config['ASGI_WSGI_THREADS'])
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD') \
+                and async_db.available:
+            environ = _environ(scope)
+            try:
+                endpoint, view_args = self.app.url_map.bind_to_environ(environ).match()
+            except HTTPException:
+                endpoint = None
+            view = ASYNC_VIEWS.get(endpoint)
+            if view is not None:
+                return await self._dispatch(view, view_args, environ, send)
+
+        await self.wsgi(scope, receive, send)
+
+    async def _dispatch(self, view, view_args: dict, environ: dict, send) -> None:
+        app = self.app
+        ctx = app.request_context(environ)
+        ctx.push()
+        try:
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    rv = await view(**view_args)
+            except Exception as e:
+                try:
+                    rv = app.handle_user_exception(e)
+                except Exception as e:
+                    rv = app.handle_exception(e)
+            response: Response = app.process_response(app.make_response(rv))
+            body = b'' if environ['REQUEST_METHOD'] == 'HEAD' \
+                else b''.join(response.iter_encoded())
+            response.close()
+        finally:
+            ctx.pop()
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(name.lower().encode('latin-1'), value.encode('latin-1'))
+                        for name, value in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await async_db.dispose()
+                # Sin esto el forkserver y sus hijos sobreviven al worker
+                # de uvicorn (en gthread lo hace worker_exit)
+                password_hasher.shutdown(wait=True)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+
+def _environ(scope) -> dict:
+    """Entorno WSGI de una petición ASGI sin cuerpo (GET/HEAD)."""
+    server = scope.get('server') or ('localhost', 80)
+    client = scope.get('client') or ('', 0)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': scope.get('root_path', '').encode().decode('latin-1'),
+        'PATH_INFO': scope['path'].encode().decode('latin-1'),
+        'QUERY_STRING': scope['query_string'].decode('latin-1'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope.get('http_version', '1.1')}",
+        'REMOTE_ADDR': client[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False,
+    }
+    for name, value in scope['headers']:
+        name = name.decode('latin-1')
+        key = name.upper().replace('-', '_')
+        if key not in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            key = f'HTTP_{key}'
+        value = value.decode('latin-1')
+        environ[key] = f'{environ[key]},{value}' if key in environ else value
+    return environ
@@ -0,0 +1,87 @@
+from flask import Flask, current_app, g
+from sqlalchemy import event
+from sqlalchemy.engine import URL, make_url
+
+from app.utils.database import is_memory_sqlite, pool_pre_ping, sqlite_pragma_listener
+from app.utils.read_replica import REPLICA_BIND
+
+# Driver asyncio para cada backend síncrono
+ASYNC_DRIVERS = {'sqlite': 'aiosqlite', 'postgresql': 'asyncpg'}
+
+
+def async_url(uri: str | URL) -> str:
+    """URL equivalente con el driver asyncio (sqlite -> sqlite+aiosqlite)."""
+    url = make_url(uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f'Sin driver asyncio para {backend}')
+    return url.set(drivername=f'{backend}+{ASYNC_DRIVERS[backend]}') \
+        .render_as_string(hide_password=False)
+
+
+class AsyncDatabase:
+    """
+    Engines asyncio (AsyncEngine) para las lecturas que se sirven en modo
+    ASGI (app/asgi.py). Usan la misma base de datos, réplica y PRAGMAs que
+    db; se crean en la primera petición de cada worker, así que el modo
+    WSGI no necesita aiosqlite ni asyncpg instalados.
+
+    La URL sale del engine síncrono de cada bind y no de la config:
+    Flask-SQLAlchemy resuelve las rutas SQLite relativas dentro de la
+    carpeta instance, y las dos sesiones deben abrir el mismo fichero.
+    """
+
+    def __init__(self) -> None:
+        # Nombre del engine -> bind de Flask-SQLAlchemy (None es el primario)
+        self._binds: dict[str, str | None] = {}
+        self._options: dict = {}
+        self._engines: dict = {}
+        self._pragmas = None
+
+    def init_app(self, app: Flask) -> None:
+        """Debe llamarse después de read_replica.init_app."""
+        uri: str = app.config['SQLALCHEMY_DATABASE_URI']
+        self._engines = {}
+        self._binds = {}
+        if is_memory_sqlite(uri) or make_url(uri).get_backend_name() not in ASYNC_DRIVERS:
+            # Cada conexión aiosqlite a :memory: sería una base de datos vacía
+            return
+
+        self._binds['primary'] = None
+        if REPLICA_BIND in (app.config.get('SQLALCHEMY_BINDS') or {}):
+            self._binds[REPLICA_BIND] = REPLICA_BIND
+
+        self._options = {
+            'pool_size': app.config['DB_POOL_SIZE'],
+            'max_overflow': app.config['DB_MAX_OVERFLOW'],
+            'pool_timeout': app.config['DB_POOL_TIMEOUT'],
+            'pool_recycle': app.config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': pool_pre_ping(app.config),
+        }
+        self._pragmas = sqlite_pragma_listener(app.config)
+
+    @property
+    def available(self) -> bool:
+        return 'primary' in self._binds
+
+    def engine(self, name: str = 'primary'):
+        if name not in self._engines:
+            from sqlalchemy.ext.asyncio import create_async_engine
+            sync_engine = current_app.extensions['sqlalchemy'].engines[self._binds[name]]
+            engine = create_async_engine(async_url(sync_engine.url), **self._options)
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine.sync_engine, 'connect', self._pragmas)
+            self._engines[name] = engine
+        return self._engines[name]
+
+    def session(self):
+        """AsyncSession de la petición; va a la réplica si read_replica lo decidió."""
+        from sqlalchemy.ext.asyncio import AsyncSession
+        name = REPLICA_BIND if g.get('db_read_replica') and REPLICA_BIND in self._binds \
+            else 'primary'
+        return AsyncSession(self.engine(name), expire_on_commit=False)
+
+    async def dispose(self) -> None:
+        for engine in self._engines.values():
+            await engine.dispose()
+        self._engines = {}
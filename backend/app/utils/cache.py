@@ -0,0 +1,88 @@
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Flask
+
+
+class ResponseCache:
+    """
+    Caché LRU en memoria de cuerpos de respuesta, acotada en bytes y con
+    TTL. Las claves incluyen la versión de catalog_versions, de modo que una
+    escritura en otro worker deja obsoletas las entradas de este sin
+    necesidad de avisarle; invalidate() libera antes las del worker local.
+    """
+
+    def __init__(self, max_bytes: int = 0, ttl: float = 0) -> None:
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, bytes, tuple[str, ...]]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def init_app(self, app: Flask) -> None:
+        self.max_bytes = app.config.get('CATALOG_CACHE_MAX_BYTES', 0)
+        self.ttl = app.config.get('CATALOG_CACHE_TTL', 0)
+        self.clear()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key: str, body: bytes, tags: tuple[str, ...]) -> None:
+        if not self.enabled or len(body) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, body, tags)
+            self._size += len(body)
+
+            while self._size > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, *tags: str) -> None:
+        """Elimina las entradas que dependen de alguna de las tablas dadas."""
+        with self._lock:
+            stale = [key for key, (_, _, entry_tags) in self._entries.items()
+                     if set(entry_tags) & set(tags)]
+            for key in stale:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': len(self._entries),
+            'bytes': self._size
+        }
+
+    def _remove(self, key: str) -> None:
+        _, body, _ = self._entries.pop(key)
+        self._size -= len(body)
@@ -0,0 +1,67 @@
+import sqlite3
+
+from flask import Flask
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+
+def is_memory_sqlite(uri: str) -> bool:
+    url = make_url(uri)
+    return url.get_backend_name() == 'sqlite' \
+        and url.database in (None, '', ':memory:')
+
+
+def configure_engine_options(app: Flask) -> None:
+    """
+    Añade el tamaño del pool y demás opciones del engine desde la config.
+    Se llama antes de db.init_app. SQLite en memoria usa StaticPool, que no
+    admite estas opciones.
+    """
+    if is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+        return
+
+    options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+    options.setdefault('pool_size', app.config['DB_POOL_SIZE'])
+    options.setdefault('max_overflow', app.config['DB_MAX_OVERFLOW'])
+    options.setdefault('pool_timeout', app.config['DB_POOL_TIMEOUT'])
+    options.setdefault('pool_recycle', app.config['DB_POOL_RECYCLE'])
+    options.setdefault('pool_pre_ping', pool_pre_ping(app.config))
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def pool_pre_ping(config) -> bool:
+    """DB_POOL_PRE_PING, o por defecto activo salvo en SQLite."""
+    if config.get('DB_POOL_PRE_PING') is not None:
+        return config['DB_POOL_PRE_PING']
+    return make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name() != 'sqlite'
+
+
+def init_sqlite_pragmas(app: Flask) -> None:
+    """
+    Aplica SQLITE_PRAGMAS a cada conexión nueva de los engines SQLite de la
+    app. Se llama después de db.init_app; la config se lee al conectar.
+    """
+    with app.app_context():
+        engines = list(app.extensions['sqlalchemy'].engines.values())
+
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', sqlite_pragma_listener(app.config))
+
+
+def sqlite_pragma_listener(config):
+    def set_pragmas(dbapi_connection, connection_record) -> None:
+        if not config.get('SQLITE_TUNING'):
+            return
+
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in config.get('SQLITE_PRAGMAS', {}).items():
+                try:
+                    cursor.execute(f'PRAGMA {name} = {value}')
+                except sqlite3.OperationalError:
+                    # Conexiones mode=ro (réplica) no pueden cambiar journal_mode
+                    pass
+        finally:
+            cursor.close()
+    return set_pragmas
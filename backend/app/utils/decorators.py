@@ -1,7 +1,15 @@
+import hashlib
+from datetime import datetime
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity
+from flask import Response, current_app, g, jsonify, make_response, request
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from app.extensions import admins, async_db, catalog_cache, read_replica as replica
+from app.models.catalog_version import CatalogVersion
 from app.models.user import User
+from app.utils.metrics import CATALOG_CACHE_LOOKUPS
+
+# Vistas async por endpoint de Flask, servidas de forma nativa en modo ASGI
+ASYNC_VIEWS: dict = {}
 
 
 def admin_required():
@@ -9,6 +17,14 @@ def admin_required():
         @wraps(fn)
         def wrapper(*args, **kwargs):
             user_id: int = int(get_jwt_identity())
+            claims: dict = get_jwt()
+
+            # El claim 'role' evita la consulta a users mientras el usuario
+            # siga siendo admin en la base de datos; si no, se comprueba
+            # contra users (404 si se borró, 403 si se degradó)
+            if claims.get('role') == 'admin' and user_id in admins:
+                return fn(*args, **kwargs)
+
             user: User | None = User.query.get(user_id)
 
             if not user:
@@ -20,3 +36,126 @@ def admin_required():
             return fn(*args, **kwargs)
         return wrapper
     return decorator
+
+
+def catalog_conditional(*tables: str):
+    """
+    Respuestas condicionales (ETag / Last-Modified) para lecturas del
+    catálogo. El ETag se deriva de la versión de las tablas indicadas y de
+    la URL, así que un If-None-Match válido devuelve 304 con una sola
+    consulta a catalog_versions, sin cargar modelos ni serializar. Las
+    respuestas 200 se guardan en catalog_cache con el ETag como clave.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            etag, last_modified = _catalog_validators(
+                CatalogVersion.current(*tables))
+
+            if _not_modified(etag, last_modified):
+                response = make_response('', 304)
+            elif (response := _cached_catalog_response(etag)) is None:
+                response = make_response(fn(*args, **kwargs))
+                _store_catalog_response(response, etag, tables)
+
+            return _finish_catalog_response(response, etag, last_modified)
+        return wrapper
+    return decorator
+
+
+def _catalog_validators(versions) -> tuple[str, datetime | None]:
+    stamp = ';'.join(f'{name}:{version}' for name, version, _ in versions)
+    etag = hashlib.sha1(f'{request.full_path}|{stamp}'.encode()).hexdigest()
+    last_modified = max(
+        (updated_at for _, _, updated_at in versions if updated_at), default=None)
+    return etag, last_modified
+
+
+def _not_modified(etag: str, last_modified: datetime | None) -> bool:
+    if request.if_none_match:
+        return request.if_none_match.contains(etag)
+    if last_modified and request.if_modified_since:
+        return last_modified.replace(microsecond=0, tzinfo=None) \
+            <= request.if_modified_since.replace(tzinfo=None)
+    return False
+
+
+def _cached_catalog_response(etag: str) -> Response | None:
+    if not catalog_cache.enabled:
+        return None
+    # Toda búsqueda sin acierto es un fallo, se guarde luego la respuesta o no
+    if (body := catalog_cache.get(etag)) is None:
+        CATALOG_CACHE_LOOKUPS.labels('miss').inc()
+        return None
+    CATALOG_CACHE_LOOKUPS.labels('hit').inc()
+    return current_app.response_class(body, mimetype=current_app.json.mimetype)
+
+
+def _store_catalog_response(response: Response, etag: str, tables) -> None:
+    if response.status_code == 200 and catalog_cache.enabled:
+        catalog_cache.set(etag, response.get_data(), tables)
+
+
+def _finish_catalog_response(response: Response, etag: str,
+                             last_modified: datetime | None) -> Response:
+    if response.status_code in (200, 304):
+        response.set_etag(etag)
+        if last_modified:
+            response.last_modified = last_modified
+        response.cache_control.public = True
+        response.cache_control.no_cache = True
+    return response
+
+
+def read_replica():
+    """
+    Ejecuta las consultas de la vista en la réplica de lectura, salvo que el
+    usuario haya escrito hace menos de READ_YOUR_WRITES_SECONDS.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if replica.should_use_replica():
+                g.db_read_replica = True
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def async_view(endpoint: str, jwt: bool = False, replica_reads: bool = False,
+               catalog_tables: tuple[str, ...] = ()):
+    """
+    Registra una versión async de la vista endpoint para el modo ASGI. La
+    función recibe una AsyncSession y los argumentos de la URL. jwt,
+    replica_reads y catalog_tables equivalen a jwt_required(),
+    read_replica() y catalog_conditional(*catalog_tables) de la vista
+    síncrona.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        async def wrapper(**kwargs):
+            if jwt:
+                verify_jwt_in_request()
+            if replica_reads and replica.should_use_replica():
+                g.db_read_replica = True
+
+            async with async_db.session() as session:
+                if not catalog_tables:
+                    return await fn(session, **kwargs)
+
+                rows = (await session.execute(
+                    CatalogVersion.select_current(*catalog_tables))).all()
+                etag, last_modified = _catalog_validators(
+                    CatalogVersion.from_rows(catalog_tables, rows))
+
+                if _not_modified(etag, last_modified):
+                    response = make_response('', 304)
+                elif (response := _cached_catalog_response(etag)) is None:
+                    response = make_response(await fn(session, **kwargs))
+                    _store_catalog_response(response, etag, catalog_tables)
+
+                return _finish_catalog_response(response, etag, last_modified)
+
+        ASYNC_VIEWS[endpoint] = wrapper
+        return fn
+    return decorator
@@ -0,0 +1,81 @@
+import json
+import os
+
+import click
+from flask import Flask
+
+SPEC_ENDPOINT = 'apispec'
+
+SWAGGER_CONFIG = {
+    "headers": [],
+    "specs": [{
+        "endpoint": SPEC_ENDPOINT,
+        "route": '/apispec.json',
+    }],
+    "static_url_path": "/flasgger_static",
+    "swagger_ui": True,
+    "specs_route": "/docs",
+    "openapi": "3.0.0"
+}
+
+SWAGGER_TEMPLATE = {
+    "info": {
+        "title": "DevMart API",
+        "description": "E-commerce REST API with JWT authentication and role-based access control",
+        "version": "1.0.0"
+    },
+    "components": {
+        "securitySchemes": {
+            "Bearer": {
+                "type": "http",
+                "scheme": "bearer",
+                "bearerFormat": "JWT",
+                "description": "JWT Authorization header using Bearer scheme"
+            }
+        }
+    },
+    "security": [{"Bearer": []}]
+}
+
+
+def init_docs(app: Flask) -> None:
+    """
+    Registra /docs y /apispec.json salvo con API_DOCS_ENABLED=false, en
+    cuyo caso ni siquiera se importa flasgger (y jsonschema). Si existe
+    API_SPEC_FILE (generado con `flask apispec` al construir la imagen) se
+    sirve ese JSON en vez de parsear el YAML de los docstrings en cada
+    worker; hay que regenerarlo al cambiar la documentación.
+    """
+    if not app.config['API_DOCS_ENABLED']:
+        return
+
+    from flasgger import Swagger
+
+    class PrebuiltSwagger(Swagger):
+        prebuilt: dict | None = None
+
+        def get_apispecs(self, endpoint: str = SPEC_ENDPOINT) -> dict:
+            # flasgger no usa su caché en debug; la spec precompilada sí
+            if endpoint == SPEC_ENDPOINT and self.prebuilt is not None:
+                return self.prebuilt
+            return super().get_apispecs(endpoint)
+
+    swagger = PrebuiltSwagger(app, config=SWAGGER_CONFIG, template=SWAGGER_TEMPLATE)
+
+    spec_file: str | None = app.config.get('API_SPEC_FILE')
+    if spec_file and os.path.exists(spec_file):
+        with open(spec_file) as f:
+            swagger.prebuilt = json.load(f)
+
+    @app.cli.command('apispec')
+    @click.argument('path', required=False)
+    def build_apispec(path: str | None) -> None:
+        """Write the OpenAPI spec to PATH (default: API_SPEC_FILE)."""
+        swagger.prebuilt = None
+        swagger.apispecs.pop(SPEC_ENDPOINT, None)
+        with app.test_request_context():
+            spec = swagger.get_apispecs(SPEC_ENDPOINT)
+        path = path or spec_file
+        with open(path, 'w') as f:
+            json.dump(spec, f, separators=(',', ':'))
+        click.echo(f'OpenAPI spec written to {path}')
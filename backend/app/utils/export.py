@@ -0,0 +1,64 @@
+import csv
+import io
+from datetime import datetime
+from typing import Iterator
+
+from flask import Response, current_app, request, stream_with_context
+from sqlalchemy import Select
+
+from app.extensions import db
+
+EXPORT_FORMATS = {'csv': 'text/csv', 'ndjson': 'application/x-ndjson'}
+
+
+def parse_id_range() -> tuple[int | None, int | None]:
+    """
+    Rango de ids (after_id, until_id] del query string para retomar una
+    exportación. Lanza ValueError si alguno no es un entero.
+    """
+    bounds = []
+    for name in ('after_id', 'until_id'):
+        value = request.args.get(name)
+        try:
+            bounds.append(int(value) if value is not None else None)
+        except ValueError as e:
+            raise ValueError(f'{name} debe ser un número entero') from e
+    return bounds[0], bounds[1]
+
+
+def export_response(stmt: Select, fmt: str, filename: str) -> Response:
+    """
+    Respuesta chunked que recorre stmt con un cursor de servidor
+    (yield_per) y escribe cada partición como un bloque CSV o NDJSON, de
+    modo que la memoria no crece con el tamaño de la tabla.
+    """
+    batch_size = current_app.config['EXPORT_BATCH_SIZE']
+    columns = [column.key for column in stmt.selected_columns]
+
+    def generate() -> Iterator[bytes]:
+        result = db.session.execute(stmt.execution_options(yield_per=batch_size))
+        if fmt == 'csv':
+            yield _csv_chunk([columns])
+        for partition in result.partitions():
+            if fmt == 'csv':
+                yield _csv_chunk([_csv_value(v) for v in row] for row in partition)
+            else:
+                yield ''.join(
+                    current_app.json.dumps(dict(zip(columns, row))) + '\n'
+                    for row in partition).encode()
+        result.close()
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype=EXPORT_FORMATS[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}.{fmt}'})
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    return buffer.getvalue().encode()
+
+
+def _csv_value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
@@ -0,0 +1,79 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from flask import Flask
+
+from app.utils.database import is_memory_sqlite
+
+logger = logging.getLogger('app.idempotency')
+
+MAX_KEY_LENGTH = 255
+
+
+def request_fingerprint(data) -> str:
+    """sha256 del cuerpo JSON normalizado, para detectar reutilizar la clave."""
+    payload = json.dumps(data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class IdempotencySweeper:
+    """
+    Hilo en segundo plano, uno por proceso, que borra cada
+    sweep_seconds las claves de idempotencia caducadas. Se arranca en la
+    primera petición de cada worker para que sobreviva al fork de gunicorn.
+    """
+
+    def __init__(self) -> None:
+        self.ttl_seconds = 24 * 3600
+        self.sweep_seconds = 3600.0
+        self._app: Flask | None = None
+        self._pid: int | None = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.ttl_seconds = app.config.get('IDEMPOTENCY_TTL_SECONDS', self.ttl_seconds)
+        self.sweep_seconds = app.config.get('IDEMPOTENCY_SWEEP_SECONDS', self.sweep_seconds)
+        self._app = app
+        self._pid = None
+
+        # Cada conexión a SQLite en memoria es una base de datos distinta
+        if self.sweep_seconds > 0 and not is_memory_sqlite(
+                app.config['SQLALCHEMY_DATABASE_URI']):
+            app.before_request(self._ensure_started)
+
+    def sweep(self) -> int:
+        """Borra las claves caducadas; requiere un contexto de aplicación."""
+        from app.extensions import db
+        from app.models.idempotency_key import IdempotencyKey
+        try:
+            deleted = IdempotencyKey.delete_expired()
+            db.session.commit()
+            return deleted
+        finally:
+            db.session.remove()
+
+    def _ensure_started(self) -> None:
+        if self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            threading.Thread(
+                target=self._run, name='idempotency-sweeper', daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.sweep_seconds)
+            try:
+                with self._app.app_context():
+                    deleted = self.sweep()
+                if deleted:
+                    logger.info('Borradas %d claves de idempotencia caducadas', deleted)
+            except Exception:
+                logger.exception('Error al barrer las claves de idempotencia')
@@ -0,0 +1,137 @@
+import json
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+
+from flask import Flask
+from sqlalchemy import and_, delete, or_, select, update
+
+from app.extensions import db
+from app.models.job import Job
+
+logger = logging.getLogger('app.jobs')
+
+HANDLERS: dict[str, Callable[[dict], None]] = {}
+
+# Cada cuánto borra cada worker, con la cola vacía, los trabajos 'failed'
+# ya fuera de JOB_FAILED_RETENTION_SECONDS
+PURGE_INTERVAL_SECONDS = 3600
+
+
+def handler(kind: str):
+    """Registra la función que procesa los trabajos de tipo kind."""
+    def decorator(fn: Callable[[dict], None]) -> Callable[[dict], None]:
+        HANDLERS[kind] = fn
+        return fn
+    return decorator
+
+
+def claim_next(lock_timeout: float) -> Job | None:
+    """
+    Reserva el siguiente trabajo vencido con un UPDATE condicional, de modo
+    que dos workers nunca procesan el mismo. Los trabajos 'running' cuyo
+    worker murió hace más de lock_timeout segundos se vuelven a reservar.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=lock_timeout)
+
+    while True:
+        candidate = db.session.execute(
+            select(Job.id, Job.status)
+            .where(or_(
+                and_(Job.status == 'pending', Job.run_at <= now),
+                and_(Job.status == 'running', Job.locked_at < stale)))
+            .order_by(Job.run_at, Job.id)
+            .limit(1)
+        ).first()
+        if candidate is None:
+            db.session.commit()
+            return None
+
+        result = db.session.execute(
+            update(Job)
+            .where(Job.id == candidate.id, Job.status == candidate.status,
+                   or_(Job.status == 'pending', Job.locked_at < stale))
+            .values(status='running', attempts=Job.attempts + 1, locked_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        if result.rowcount == 1:
+            return db.session.get(Job, candidate.id)
+
+
+def run_job(job: Job, max_attempts: int) -> bool:
+    """
+    Ejecuta el trabajo reservado. Si termina bien se borra; si falla se
+    reprograma con espera exponencial o queda 'failed' tras max_attempts.
+    """
+    job_id, kind, attempts = job.id, job.kind, job.attempts
+    try:
+        fn = HANDLERS.get(kind)
+        if fn is None:
+            raise LookupError(f'Sin handler para el trabajo {kind}')
+        fn(json.loads(job.payload))
+        db.session.execute(delete(Job).where(Job.id == job_id))
+        db.session.commit()
+        return True
+    except Exception as e:
+        db.session.rollback()
+        logger.exception('Error en el trabajo %s (%s)', job_id, kind)
+        failed = attempts >= max_attempts
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job_id)
+            .values(status='failed' if failed else 'pending',
+                    run_at=datetime.now(timezone.utc) + timedelta(seconds=2 ** attempts),
+                    locked_at=None,
+                    last_error=repr(e))
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return False
+
+
+def work(app: Flask, stop: threading.Event | None = None,
+         once: bool = False) -> int:
+    """
+    Bucle de un worker: reserva y ejecuta trabajos hasta que stop se
+    activa, o hasta vaciar la cola si once es True. Devuelve cuántos
+    trabajos procesó.
+    """
+    stop = stop or threading.Event()
+    poll_seconds = app.config['JOB_POLL_SECONDS']
+    lock_timeout = app.config['JOB_LOCK_TIMEOUT_SECONDS']
+    max_attempts = app.config['JOB_MAX_ATTEMPTS']
+    retention = app.config['JOB_FAILED_RETENTION_SECONDS']
+    processed = 0
+    purged_at = -PURGE_INTERVAL_SECONDS
+
+    logger.info('Worker %s procesando la cola de trabajos', os.getpid())
+    while not stop.is_set():
+        job = None
+        with app.app_context():
+            try:
+                job = claim_next(lock_timeout)
+                if job is not None:
+                    run_job(job, max_attempts)
+                    processed += 1
+                elif time.monotonic() - purged_at >= PURGE_INTERVAL_SECONDS:
+                    purged_at = time.monotonic()
+                    deleted = Job.delete_failed(retention)
+                    db.session.commit()
+                    if deleted:
+                        logger.info('Borrados %d trabajos fallidos antiguos', deleted)
+            except Exception:
+                logger.exception('Error al leer la cola de trabajos')
+            finally:
+                db.session.remove()
+
+        if job is None:
+            if once:
+                break
+            stop.wait(poll_seconds)
+
+    return processed
@@ -0,0 +1,107 @@
+import os
+import time
+
+from flask import Flask, Response, g, request
+from prometheus_client import (CONTENT_TYPE_LATEST, CollectorRegistry, Counter,
+                               Gauge, Histogram, generate_latest, multiprocess)
+from sqlalchemy import event
+from sqlalchemy.pool import Pool, QueuePool
+
+from app.utils.database import is_memory_sqlite
+
+# Con PROMETHEUS_MULTIPROC_DIR definido (ver gunicorn.conf.py) cada worker
+# escribe sus valores en ficheros de ese directorio y /metrics los agrega
+
+REQUEST_LATENCY = Histogram(
+    'http_request_duration_seconds', 'Latencia de las peticiones HTTP',
+    ['blueprint', 'endpoint', 'method', 'status'])
+REQUESTS_IN_PROGRESS = Gauge(
+    'http_requests_in_progress', 'Peticiones HTTP en curso',
+    ['blueprint', 'endpoint', 'method'], multiprocess_mode='livesum')
+DB_POOL_CHECKOUT = Histogram(
+    'db_pool_checkout_seconds',
+    'Tiempo de espera para obtener una conexión del pool',
+    buckets=(.0005, .001, .0025, .005, .01, .025, .05, .1, .25, .5, 1, 2.5, 5, 10, 30))
+DB_POOL_CHECKED_OUT = Gauge(
+    'db_pool_checked_out_connections', 'Conexiones del pool en uso',
+    multiprocess_mode='livesum')
+CATALOG_CACHE_LOOKUPS = Counter(
+    'catalog_cache_lookups_total', 'Consultas a la caché del catálogo',
+    ['result'])
+ORDER_EVENTS = Counter(
+    'orders_total', 'Pedidos creados, cancelados o con cambio de estado',
+    ['event'])
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool que mide cuánto tarda cada checkout de conexión."""
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            DB_POOL_CHECKOUT.observe(time.perf_counter() - start)
+
+
+class Metrics:
+    _listening = False
+
+    def init_app(self, app: Flask) -> None:
+        """Debe llamarse antes de db.init_app para poder fijar poolclass."""
+        options = dict(app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}))
+        if not is_memory_sqlite(app.config['SQLALCHEMY_DATABASE_URI']):
+            options.setdefault('poolclass', TimedQueuePool)
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+        if not Metrics._listening:
+            event.listen(Pool, 'checkout', _on_checkout)
+            event.listen(Pool, 'checkin', _on_checkin)
+            Metrics._listening = True
+
+        app.before_request(_start_request)
+        app.after_request(_observe_request)
+        app.teardown_request(_end_request)
+
+
+def render_metrics() -> Response:
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        data = generate_latest(registry)
+    else:
+        data = generate_latest()
+    return Response(data, mimetype=CONTENT_TYPE_LATEST)
+
+
+def _labels() -> tuple[str, str, str]:
+    # Sin endpoint (404) se agrupa para no crear una serie por URL
+    return request.blueprint or '', request.endpoint or 'not_found', request.method
+
+
+def _start_request() -> None:
+    g.metrics_start = time.perf_counter()
+    g.metrics_labels = _labels()
+    REQUESTS_IN_PROGRESS.labels(*g.metrics_labels).inc()
+
+
+def _observe_request(response: Response) -> Response:
+    start: float | None = g.get('metrics_start')
+    if start is not None:
+        REQUEST_LATENCY.labels(*g.metrics_labels, response.status_code) \
+            .observe(time.perf_counter() - start)
+    return response
+
+
+def _end_request(exc: BaseException | None) -> None:
+    labels = g.pop('metrics_labels', None)
+    if labels is not None:
+        REQUESTS_IN_PROGRESS.labels(*labels).dec()
+
+
+def _on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+    DB_POOL_CHECKED_OUT.inc()
+
+
+def _on_checkin(dbapi_connection, connection_record) -> None:
+    DB_POOL_CHECKED_OUT.dec()
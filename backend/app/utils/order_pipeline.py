@@ -0,0 +1,77 @@
+import logging
+
+from flask import current_app
+from sqlalchemy import select, update
+
+from app.extensions import db
+from app.models.job import Job
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.utils.job_queue import handler
+from app.utils.sales import record_status_change
+
+logger = logging.getLogger('app.orders')
+
+
+# Trabajos encolados por las rutas de pedidos; los ejecutan los procesos
+# de worker.py fuera del ciclo de la petición
+
+
+@handler('order.created')
+def order_created(payload: dict) -> None:
+    order: Order | None = db.session.get(Order, payload['order_id'])
+    if order is None:
+        return
+
+    _notify(order, f'Pedido {order.id} recibido por ${order.total:.2f}')
+    _reconcile_stock(order.id)
+
+    # Avance automático pending -> processing, condicional para no pisar
+    # un cambio hecho mientras tanto (p. ej. una cancelación)
+    if current_app.config['ORDER_AUTO_PROCESS']:
+        result = db.session.execute(
+            update(Order)
+            .where(Order.id == order.id, Order.status == 'pending')
+            .values(status='processing')
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 1:
+            record_status_change(order, 'pending', 'processing')
+            Job.enqueue('order.status_changed',
+                        {'order_id': order.id, 'status': 'processing'})
+
+
+@handler('order.status_changed')
+def order_status_changed(payload: dict) -> None:
+    order: Order | None = db.session.get(Order, payload['order_id'])
+    if order is not None:
+        _notify(order, f"Pedido {order.id} ahora está {payload['status']}")
+
+
+@handler('order.cancelled')
+def order_cancelled(payload: dict) -> None:
+    order: Order | None = db.session.get(Order, payload['order_id'])
+    if order is not None:
+        _notify(order, f'Pedido {order.id} cancelado, stock restaurado')
+    _reconcile_stock(payload['order_id'])
+
+
+def _notify(order: Order, message: str) -> None:
+    """Notificación al cliente; por ahora solo se registra en el log."""
+    email = db.session.scalar(select(User.email).where(User.id == order.user_id))
+    logger.info('Notificación a %s: %s', email, message)
+
+
+def _reconcile_stock(order_id: int) -> None:
+    """Avisa de los productos del pedido que quedan con poco stock."""
+    threshold = current_app.config['LOW_STOCK_THRESHOLD']
+    rows = db.session.execute(
+        select(Product.id, Product.name, Product.stock)
+        .join(OrderItem, OrderItem.product_id == Product.id)
+        .where(OrderItem.order_id == order_id, Product.stock <= threshold)
+    ).all()
+    for product_id, name, stock in rows:
+        logger.warning('Stock bajo: producto %s (%s) con %s unidades',
+                       product_id, name, stock)
@@ -0,0 +1,38 @@
+import base64
+import json
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+
+def encode_cursor(created_at: datetime, id: int) -> str:
+    """Opaque keyset cursor pointing at the last row of a page."""
+    payload = json.dumps([created_at.isoformat(), id]).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """Inverse of encode_cursor. Raises ValueError on malformed input."""
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        created_at, id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), int(id)
+    except (TypeError, ValueError, json.JSONDecodeError) as e:
+        raise ValueError('Cursor inválido') from e
+
+
+def parse_limit(value: str | None) -> int:
+    """Page size from the query string, clamped to MAX_PAGE_SIZE."""
+    if value is None:
+        return DEFAULT_PAGE_SIZE
+
+    try:
+        limit = int(value)
+    except ValueError as e:
+        raise ValueError('limit debe ser un número entero') from e
+
+    if limit <= 0:
+        raise ValueError('limit debe ser mayor a 0')
+
+    return min(limit, MAX_PAGE_SIZE)
@@ -0,0 +1,101 @@
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import Flask
+from werkzeug.security import check_password_hash, generate_password_hash
+
+
+class PasswordHashTimeout(Exception):
+    """El pool no devolvió el hash en PASSWORD_HASH_TIMEOUT segundos."""
+
+
+class PasswordHasher:
+    """
+    Hash de contraseñas con método configurable (PASSWORD_HASH_METHOD, en el
+    formato de werkzeug, p. ej. 'scrypt:32768:8:1' o 'pbkdf2:sha256:600000')
+    ejecutado en un pool de procesos acotado para no bloquear los hilos de
+    las peticiones. Con PASSWORD_HASH_WORKERS = 0 se calcula en línea.
+    """
+
+    def __init__(self, method: str = 'scrypt', workers: int = 0,
+                 timeout: float = 30) -> None:
+        self.method = method
+        self.workers = workers
+        self.timeout = timeout
+        self._pool: Executor | None = None
+        self._method_prefix: str | None = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        self.method = app.config.get('PASSWORD_HASH_METHOD', self.method)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', self.workers)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', self.timeout)
+        self._method_prefix = None
+        self.shutdown()
+
+    def hash(self, password: str) -> str:
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, pwhash: str, password: str) -> bool:
+        return self._run(check_password_hash, pwhash, password)
+
+    def needs_rehash(self, pwhash: str) -> bool:
+        """True si el hash se generó con otro método o factor de trabajo."""
+        if self._method_prefix is None:
+            # werkzeug completa los parámetros por defecto ('scrypt' ->
+            # 'scrypt:32768:8:1'); se obtiene una vez con un hash de prueba
+            self._method_prefix = self.hash('').split('$', 1)[0]
+        return pwhash.split('$', 1)[0] != self._method_prefix
+
+    def shutdown(self, wait: bool = False) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    def _run(self, fn, *args):
+        if self.workers <= 0:
+            return fn(*args)
+
+        pool = self._executor()
+        future = None
+        try:
+            future = pool.submit(fn, *args)
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            # Un proceso del pool murió (p. ej. el OOM killer): el executor
+            # queda roto para siempre. Se descarta para que la siguiente
+            # llamada cree otro y esta se calcula en línea
+            self._discard(pool)
+            return fn(*args)
+        except TimeoutError:
+            future.cancel()
+            raise PasswordHashTimeout() from None
+
+    def _discard(self, pool: Executor) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+
+    def _executor(self) -> Executor:
+        # Se crea bajo demanda para que cada worker de gunicorn tenga su
+        # propio pool después del fork. Con 'forkserver' los procesos del pool
+        # salen de un servidor de un solo hilo y no del worker: un fork desde
+        # un worker gthread podría heredar locks tomados por otros hilos
+        # (logging, pool de SQLAlchemy, import lock) y bloquear al hijo. Los
+        # hijos reimportan el script principal como __mp_main__, así que los
+        # scripts de entrada necesitan la guardia if __name__ == '__main__'
+        if self._pool is None:
+            with self._lock:
+                if self._pool is None:
+                    method = 'forkserver' if 'forkserver' in \
+                        multiprocessing.get_all_start_methods() else 'spawn'
+                    context = multiprocessing.get_context(method)
+                    if method == 'forkserver':
+                        context.set_forkserver_preload(['werkzeug.security'])
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers, mp_context=context)
+        return self._pool
@@ -0,0 +1,43 @@
+from flask import Config, Flask
+
+
+class FrozenConfig(Config):
+    """
+    Config de solo lectura. Con gunicorn --preload la config se comparte
+    entre workers por copy-on-write; escribir en ella durante una petición
+    haría que cada worker divergiera en silencio.
+    """
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError('La configuración es de solo lectura tras crear la app')
+
+    __setitem__ = __delitem__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+
+def freeze_app(app: Flask) -> Flask:
+    """
+    Deja la app lista para compartirse entre procesos: compila ya el
+    url_map (werkzeug lo haría en la primera petición de cada worker) y
+    congela la config. Se llama desde los hooks de gunicorn.conf.py y no
+    al importar app.wsgi, porque el CLI de Flask escribe en la config
+    (app.debug) después de cargar la app.
+    """
+    app.url_map.update()
+    app.config = FrozenConfig(app.config.root_path, app.config)
+    return app
+
+
+def flask_app(application) -> Flask:
+    """La app Flask de app.wsgi:app o de app.asgi:application."""
+    return application if isinstance(application, Flask) else application.app
+
+
+def reset_after_fork(app: Flask) -> None:
+    """
+    Llamar en cada worker tras el fork: descarta los pools de conexiones
+    heredados del master sin cerrar sus sockets, que no le pertenecen.
+    """
+    with app.app_context():
+        for engine in app.extensions['sqlalchemy'].engines.values():
+            engine.dispose(close=False)
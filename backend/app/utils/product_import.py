@@ -0,0 +1,202 @@
+import csv
+import json
+import math
+import re
+from typing import IO, Iterator
+
+from sqlalchemy import insert, select, update
+
+from app.extensions import db
+from app.models.catalog_version import CatalogVersion
+from app.models.category import Category
+from app.models.product import Product
+
+MAX_REPORTED_ERRORS = 1000
+FIELDS = ('id', 'name', 'description', 'price', 'stock', 'image_url', 'category_id')
+INVALID_ENCODING = 'Codificación no válida, se esperaba UTF-8'
+UNDECODABLE = re.compile('[\udc80-\udcff]')
+
+
+def iter_records(stream: IO[bytes], fmt: str) -> Iterator[dict]:
+    """
+    Lee registros de un CSV con cabecera o de NDJSON sin cargar todo el
+    cuerpo. Las filas que no se pueden decodificar o parsear se devuelven
+    como {'__error__': motivo} para que se informen como cualquier otro
+    error de fila: una excepción a mitad del cuerpo dejaría la importación
+    a medias (los lotes anteriores ya tienen commit) y sin resumen.
+    """
+    lines = _decoded_lines(stream)
+
+    if fmt == 'csv':
+        reader = csv.DictReader(lines)
+        while True:
+            try:
+                record = next(reader)
+            except StopIteration:
+                return
+            except csv.Error as e:
+                yield {'__error__': f'CSV inválido: {e}'}
+                continue
+            yield {'__error__': INVALID_ENCODING} \
+                if any(_undecodable(value) for value in record.values()) else record
+        return
+
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if _undecodable(line):
+            yield {'__error__': INVALID_ENCODING}
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            yield {'__error__': 'JSON inválido'}
+            continue
+        yield record if isinstance(record, dict) else {'__error__': 'Se esperaba un objeto JSON'}
+
+
+def _decoded_lines(stream: IO[bytes]) -> Iterator[str]:
+    # Línea a línea con surrogateescape: los bytes que no son UTF-8 quedan
+    # como surrogates (que UTF-8 válido nunca produce) y solo se rechaza la
+    # fila que los contiene
+    for number, line in enumerate(stream):
+        yield line.decode('utf-8-sig' if number == 0 else 'utf-8', 'surrogateescape')
+
+
+def _undecodable(value) -> bool:
+    return isinstance(value, str) and UNDECODABLE.search(value) is not None
+
+
+def validate_record(record: dict, category_ids: set[int]) -> dict:
+    """
+    Convierte y valida un registro. Lanza ValueError con el motivo si no es
+    válido. Los campos vacíos del CSV se tratan como ausentes.
+    """
+    if '__error__' in record:
+        raise ValueError(record['__error__'])
+
+    values = {key: record.get(key) for key in FIELDS
+              if record.get(key) not in (None, '')}
+
+    row: dict = {}
+    if 'id' in values:
+        row['id'] = _to_int(values['id'], 'id')
+
+    if 'name' in values:
+        row['name'] = str(values['name']).strip()
+        if not row['name'] or len(row['name']) > 200:
+            raise ValueError('name debe tener entre 1 y 200 caracteres')
+    elif 'id' not in row:
+        raise ValueError('Faltan campos para poder crear el producto')
+
+    if 'price' in values:
+        try:
+            row['price'] = float(values['price'])
+        except (TypeError, ValueError):
+            raise ValueError('price debe ser un número') from None
+        if not math.isfinite(row['price']):
+            raise ValueError('price debe ser un número')
+        if row['price'] <= 0:
+            raise ValueError('price debe ser mayor a 0')
+    elif 'id' not in row:
+        raise ValueError('Faltan campos para poder crear el producto')
+
+    if 'stock' in values:
+        row['stock'] = _to_int(values['stock'], 'stock')
+        if row['stock'] < 0:
+            raise ValueError('stock no puede ser negativo')
+    elif 'id' not in row:
+        row['stock'] = 0
+
+    if 'category_id' in values:
+        row['category_id'] = _to_int(values['category_id'], 'category_id')
+        if row['category_id'] not in category_ids:
+            raise ValueError(f"Categoria {row['category_id']} no encontrada")
+
+    for key in ('description', 'image_url'):
+        if key in values:
+            row[key] = str(values[key])
+
+    return row
+
+
+def import_products(records: Iterator[dict], batch_size: int) -> dict:
+    """
+    Inserta (sin id) o actualiza (con id) productos en lotes: un INSERT
+    executemany y un UPDATE por clave primaria por lote, cada lote en su
+    propia transacción. Devuelve el resumen con los errores por fila
+    (numeradas desde 1, sin contar la cabecera del CSV).
+    """
+    category_ids: set[int] = set(db.session.scalars(select(Category.id)))
+    summary = {'created': 0, 'updated': 0, 'failed': 0, 'errors': []}
+    batch: list[tuple[int, dict]] = []
+
+    for line_number, record in enumerate(records, start=1):
+        if not any(value not in (None, '') for value in record.values()):
+            continue
+        try:
+            batch.append((line_number, validate_record(record, category_ids)))
+        except ValueError as e:
+            _report(summary, line_number, str(e))
+
+        if len(batch) >= batch_size:
+            _flush(batch, summary)
+            batch = []
+
+    if batch:
+        _flush(batch, summary)
+
+    summary['errors'].sort(key=lambda error: error['row'])
+    return summary
+
+
+def _flush(batch: list[tuple[int, dict]], summary: dict) -> None:
+    ids = [row['id'] for _, row in batch if 'id' in row]
+    existing: set[int] = set(db.session.scalars(
+        select(Product.id).where(Product.id.in_(ids)))) if ids else set()
+
+    inserts: list[dict] = []
+    updates: list[dict] = []
+    for line_number, row in batch:
+        if 'id' not in row:
+            inserts.append(row)
+        elif row['id'] in existing:
+            updates.append(row)
+        else:
+            _report(summary, line_number, f"No se encontro el producto con id {row['id']}")
+
+    try:
+        if inserts:
+            # Filas con las mismas columnas para que se agrupen en un executemany
+            for row in inserts:
+                for key in ('description', 'image_url', 'category_id'):
+                    row.setdefault(key, None)
+            db.session.execute(insert(Product), inserts)
+        if updates:
+            # UPDATE por clave primaria; SQLAlchemy agrupa las filas por columnas
+            db.session.execute(update(Product), updates)
+        CatalogVersion.bump('products')
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        for line_number, row in batch:
+            if 'id' not in row or row['id'] in existing:
+                _report(summary, line_number, 'Error al guardar el lote')
+        return
+
+    summary['created'] += len(inserts)
+    summary['updated'] += len(updates)
+
+
+def _report(summary: dict, line_number: int, message: str) -> None:
+    summary['failed'] += 1
+    if len(summary['errors']) < MAX_REPORTED_ERRORS:
+        summary['errors'].append({'row': line_number, 'error': message})
+
+
+def _to_int(value, field: str) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f'{field} debe ser un número entero') from None
@@ -0,0 +1,115 @@
+import json
+import logging
+import time
+
+from flask import Flask, Response, current_app, g, has_request_context, jsonify, make_response, request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger('app.sql')
+
+
+class QueryStats:
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.slowest = 0.0
+        self.slowest_statement: str | None = None
+
+    def record(self, statement: str, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed >= self.slowest:
+            self.slowest = elapsed
+            self.slowest_statement = statement
+
+
+class QueryInstrumentation:
+    """
+    Cuenta y cronometra las consultas SQL de cada petición escuchando los
+    eventos de todos los engines de SQLAlchemy. Añade una cabecera
+    Server-Timing, escribe una línea JSON por petición en el logger
+    'app.sql' y, en modo testing, convierte en error 500 las peticiones que
+    superan el presupuesto de consultas de su endpoint (SQL_QUERY_BUDGETS).
+    """
+    _listening = False
+
+    def init_app(self, app: Flask) -> None:
+        if not app.config.get('SQL_INSTRUMENTATION', True):
+            return
+
+        if not QueryInstrumentation._listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            event.listen(Engine, 'handle_error', _handle_error)
+            QueryInstrumentation._listening = True
+
+        if app.config.get('SQL_STATS_LOG') and not logger.handlers:
+            logger.addHandler(logging.StreamHandler())
+            logger.setLevel(logging.INFO)
+
+        app.before_request(_start_request)
+        app.after_request(_finish_request)
+
+
+def current_stats() -> QueryStats | None:
+    return g.get('query_stats') if has_request_context() else None
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info['query_start'].pop()
+    stats = current_stats()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+
+def _handle_error(context) -> None:
+    # Si la sentencia falla no se llama a after_cursor_execute: se descarta
+    # aquí su inicio para que no se empareje con la siguiente consulta
+    if context.connection is None or context.execution_context is None:
+        return
+    starts = context.connection.info.get('query_start')
+    if starts:
+        starts.pop()
+
+
+def _start_request() -> None:
+    g.query_stats = QueryStats()
+
+
+def _finish_request(response: Response) -> Response:
+    stats: QueryStats | None = g.pop('query_stats', None)
+    if stats is None:
+        return response
+
+    response.headers.add('Server-Timing', (
+        f'db;desc="{stats.count} queries";dur={stats.total * 1000:.2f}, '
+        f'db-slowest;dur={stats.slowest * 1000:.2f}'
+    ))
+
+    if current_app.config.get('SQL_STATS_LOG'):
+        logger.info(json.dumps({
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'queries': stats.count,
+            'db_ms': round(stats.total * 1000, 2),
+            'slowest_ms': round(stats.slowest * 1000, 2),
+            'slowest': (stats.slowest_statement or '')[:300]
+        }))
+
+    budget: int | None = current_app.config.get(
+        'SQL_QUERY_BUDGETS', {}).get(request.endpoint)
+    if budget is not None and stats.count > budget:
+        message = (f'{request.endpoint} ejecutó {stats.count} consultas '
+                   f'(presupuesto: {budget})')
+        if current_app.testing:
+            return make_response(jsonify({'error': message}), 500)
+        logger.warning(message)
+
+    return response
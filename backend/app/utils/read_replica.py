@@ -0,0 +1,103 @@
+import math
+import time
+
+from flask import Flask, Response, g, has_app_context, request
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+
+from app.utils.database import is_memory_sqlite
+
+REPLICA_BIND = 'replica'
+PRIMARY_READ_UNTIL = 'Primary-Read-Until'
+PRIMARY_READ_COOKIE = 'primary_read_until'
+WRITE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class RoutingSession(Session):
+    """
+    Sesión que envía las lecturas a la réplica cuando la petición actual lo
+    ha pedido (decorador read_replica) y no hay cambios pendientes de escribir.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and has_app_context() and g.get('db_read_replica') \
+                and not self._flushing and not (self.new or self.dirty or self.deleted):
+            engine = self._db.engines.get(REPLICA_BIND)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class ReadReplica:
+    """
+    Separación lectura/escritura. Con READ_REPLICA_ENABLED se registra el bind
+    'replica' (DATABASE_REPLICA_URL o, en SQLite, el mismo fichero abierto en
+    modo solo lectura). Tras una escritura, las lecturas del mismo cliente van
+    al primario durante READ_YOUR_WRITES_SECONDS.
+
+    El plazo viaja con el cliente y no en memoria del worker, porque la
+    siguiente lectura suele llegar a otro worker o a otra máquina: la
+    respuesta de la escritura lleva la cabecera y la cookie Primary-Read-Until
+    (epoch en segundos) y el cliente la reenvía en sus peticiones. El
+    frontend la reenvía como cabecera (src/api/config/axios.ts), ya que la
+    cookie no llega en peticiones entre dominios.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.sticky_seconds = 5.0
+
+    def init_app(self, app: Flask) -> None:
+        """Debe llamarse antes de db.init_app para registrar el bind."""
+        self.sticky_seconds = app.config.get('READ_YOUR_WRITES_SECONDS', 5)
+        uri = replica_uri(app.config['SQLALCHEMY_DATABASE_URI'],
+                          app.config.get('SQLALCHEMY_REPLICA_URI'))
+        self.enabled = bool(app.config.get('READ_REPLICA_ENABLED') and uri)
+        if not self.enabled:
+            return
+
+        binds = dict(app.config.get('SQLALCHEMY_BINDS') or {})
+        binds[REPLICA_BIND] = uri
+        app.config['SQLALCHEMY_BINDS'] = binds
+        app.after_request(self._track_write)
+
+    def should_use_replica(self) -> bool:
+        if not self.enabled:
+            return False
+
+        value = request.headers.get(PRIMARY_READ_UNTIL) \
+            or request.cookies.get(PRIMARY_READ_COOKIE)
+        try:
+            until = float(value) if value else 0.0
+        except ValueError:
+            return True
+
+        # Un plazo más lejano que sticky_seconds no lo emitió este servidor:
+        # se ignora para que un cliente no fije sus lecturas al primario
+        now = time.time()
+        return not now < until <= now + self.sticky_seconds
+
+    def _track_write(self, response: Response) -> Response:
+        if request.method in WRITE_METHODS and response.status_code < 400:
+            until = f'{time.time() + self.sticky_seconds:.3f}'
+            response.headers[PRIMARY_READ_UNTIL] = until
+            response.set_cookie(
+                PRIMARY_READ_COOKIE, until, max_age=math.ceil(self.sticky_seconds),
+                httponly=True, samesite='Lax', secure=request.is_secure)
+        return response
+
+
+def replica_uri(primary: str, configured: str | None) -> str | None:
+    if configured:
+        return configured
+
+    url = make_url(primary)
+    if url.get_backend_name() != 'sqlite' or is_memory_sqlite(primary):
+        return None
+
+    database: str = url.database
+    if not url.query.get('uri'):
+        database = f'file:{database}'
+    return url.set(database=database).update_query_dict(
+        {'mode': 'ro', 'uri': 'true'}).render_as_string(hide_password=False)
+
@@ -0,0 +1,113 @@
+from datetime import date
+
+from flask import request
+from sqlalchemy import Date, delete, distinct, func, insert, select
+
+from app.extensions import db
+from app.models.order import Order
+from app.models.order_item import OrderItem
+from app.models.sales_aggregate import OrderStatusDaily, ProductSalesDaily
+
+
+# Mantenimiento incremental de las tablas de ventas. Se llama desde las
+# rutas y trabajos que cambian pedidos, antes de su commit
+
+
+def record_order_created(order: Order, lines: dict[int, tuple[int, float]]) -> None:
+    """
+    Suma un pedido nuevo a los agregados. lines es {product_id: (unidades,
+    importe)} con las líneas del pedido ya agrupadas por producto.
+    """
+    day = order.created_at.date()
+    OrderStatusDaily.add(day, {order.status: {'orders': 1, 'revenue': order.total}})
+    ProductSalesDaily.add(day, {
+        product_id: {'orders': 1, 'units': units, 'revenue': revenue}
+        for product_id, (units, revenue) in lines.items()
+    })
+
+
+def record_status_change(order: Order, old_status: str, new_status: str) -> None:
+    """
+    Mueve el pedido de la fila de old_status a la de new_status. Entrar o
+    salir de 'cancelled' resta o vuelve a sumar sus líneas en las ventas
+    por producto.
+    """
+    if old_status == new_status:
+        return
+
+    day = order.created_at.date()
+    OrderStatusDaily.add(day, {
+        old_status: {'orders': -1, 'revenue': -order.total},
+        new_status: {'orders': 1, 'revenue': order.total},
+    })
+
+    if 'cancelled' in (old_status, new_status):
+        sign = -1 if new_status == 'cancelled' else 1
+        ProductSalesDaily.add(day, {
+            product_id: {'orders': sign, 'units': sign * units, 'revenue': sign * revenue}
+            for product_id, (units, revenue) in _order_lines(order.id).items()
+        })
+
+
+def _order_lines(order_id: int) -> dict[int, tuple[int, float]]:
+    rows = db.session.execute(
+        select(OrderItem.product_id, func.sum(OrderItem.quantity),
+               func.sum(OrderItem.quantity * OrderItem.price))
+        .where(OrderItem.order_id == order_id)
+        .group_by(OrderItem.product_id)
+    ).all()
+    return {product_id: (units, revenue) for product_id, units, revenue in rows}
+
+
+def rebuild_aggregates() -> None:
+    """
+    Recalcula ambas tablas desde orders y order_items con dos INSERT ...
+    SELECT, sin hacer commit. Sirve para corregir desvíos tras cambios
+    hechos fuera de la API.
+    """
+    day = func.date(Order.created_at, type_=Date)
+
+    db.session.execute(delete(ProductSalesDaily))
+    db.session.execute(delete(OrderStatusDaily))
+
+    db.session.execute(insert(ProductSalesDaily).from_select(
+        ['day', 'product_id', 'orders', 'units', 'revenue'],
+        select(day, OrderItem.product_id, func.count(distinct(Order.id)),
+               func.sum(OrderItem.quantity),
+               func.sum(OrderItem.quantity * OrderItem.price))
+        .join(OrderItem, OrderItem.order_id == Order.id)
+        .where(Order.status != 'cancelled')
+        .group_by(day, OrderItem.product_id)
+    ))
+    db.session.execute(insert(OrderStatusDaily).from_select(
+        ['day', 'status', 'orders', 'revenue'],
+        select(day, Order.status, func.count(Order.id), func.sum(Order.total))
+        .group_by(day, Order.status)
+    ))
+
+
+def parse_date_range() -> tuple[date | None, date | None]:
+    """
+    Rango de días [from, to] (ambos incluidos, YYYY-MM-DD) del query
+    string. Lanza ValueError si alguna fecha no es válida.
+    """
+    bounds = []
+    for name in ('from', 'to'):
+        value = request.args.get(name)
+        try:
+            bounds.append(date.fromisoformat(value) if value is not None else None)
+        except ValueError as e:
+            raise ValueError(f'{name} debe ser una fecha YYYY-MM-DD') from e
+
+    if bounds[0] and bounds[1] and bounds[0] > bounds[1]:
+        raise ValueError('from no puede ser posterior a to')
+    return bounds[0], bounds[1]
+
+
+def in_range(stmt, column, since: date | None, until: date | None):
+    """Filtra stmt por column entre since y until (incluidos)."""
+    if since is not None:
+        stmt = stmt.where(column >= since)
+    if until is not None:
+        stmt = stmt.where(column <= until)
+    return stmt
@@ -0,0 +1,72 @@
+from datetime import date
+from typing import Any
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+class IsoJSONProvider(DefaultJSONProvider):
+    """
+    Proveedor JSON de la librería estándar que serializa las fechas en
+    ISO 8601, igual que los to_dict() de los modelos, en vez de RFC 822.
+    """
+    sort_keys = False
+
+    @staticmethod
+    def default(o: Any) -> Any:
+        if isinstance(o, date):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+
+class OrjsonProvider(IsoJSONProvider):
+    """
+    Proveedor basado en orjson: serializa datetime de forma nativa y
+    escribe los bytes directamente en la respuesta sin pasar por str.
+    """
+
+    def _options(self, pretty: bool = False) -> int:
+        options = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            options |= orjson.OPT_INDENT_2
+        return options
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        pretty = kwargs.get('indent') is not None
+        return orjson.dumps(
+            obj, default=self.default, option=self._options(pretty)).decode()
+
+    def loads(self, s: str | bytes, **kwargs: Any) -> Any:
+        return orjson.loads(s)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = self.compact is False or (
+            self.compact is None and self._app.debug)
+        body: bytes = orjson.dumps(
+            obj, default=self.default, option=self._options(pretty))
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def init_json_provider(app: Flask) -> None:
+    """Selecciona el proveedor JSON según JSON_PROVIDER ('orjson' o 'std')."""
+    if app.config.get('JSON_PROVIDER') == 'orjson' and orjson is not None:
+        app.json = OrjsonProvider(app)
+    else:
+        app.json = IsoJSONProvider(app)
+
+
+def row_dicts(query, model) -> list[dict]:
+    """
+    Ejecuta la query seleccionando solo las columnas de la tabla del
+    modelo y devuelve dicts planos, sin construir objetos ORM ni pasar
+    por la identity map. Las claves coinciden con las de model.to_dict()
+    cuando este expone todas las columnas.
+    """
+    columns = model.__table__.columns
+    return [row._asdict() for row in query.with_entities(*columns)]
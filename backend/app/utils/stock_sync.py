@@ -0,0 +1,81 @@
+from sqlalchemy import bindparam, case, select, update
+
+from app.extensions import db
+from app.models.product import Product
+
+# Ids por SELECT ... IN, por debajo del límite de variables de SQLite
+ID_CHUNK_SIZE = 500
+
+
+def parse_adjustments(items) -> dict[int, tuple[str, int]]:
+    """
+    Valida la lista de {id, stock} / {id, delta} y la reduce a una
+    operación por producto respetando el orden: un stock fija el valor y
+    los delta posteriores se suman a él sin bajarlo de 0. Lanza ValueError
+    con el índice del elemento inválido.
+    """
+    if not isinstance(items, list) or not items:
+        raise ValueError('Se esperaba una lista de ajustes no vacía')
+
+    adjustments: dict[int, tuple[str, int]] = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict) or not _is_int(item.get('id')) \
+                or ('stock' in item) == ('delta' in item):
+            raise ValueError(
+                f'Ajuste {index}: se requiere id y solo uno de stock o delta')
+
+        if 'stock' in item:
+            if not _is_int(item['stock']) or item['stock'] < 0:
+                raise ValueError(f'Ajuste {index}: stock debe ser un entero >= 0')
+            adjustments[item['id']] = ('stock', item['stock'])
+            continue
+
+        if not _is_int(item['delta']):
+            raise ValueError(f'Ajuste {index}: delta debe ser un entero')
+        kind, value = adjustments.get(item['id'], ('delta', 0))
+        if kind == 'stock':
+            # Tras un stock el valor ya es absoluto: el delta no lo baja de 0,
+            # igual que cuando se aplica sobre la fila
+            adjustments[item['id']] = ('stock', max(value + item['delta'], 0))
+        else:
+            adjustments[item['id']] = ('delta', value + item['delta'])
+
+    return adjustments
+
+
+def apply_adjustments(adjustments: dict[int, tuple[str, int]]) -> tuple[int, list[int]]:
+    """
+    Aplica los ajustes con dos UPDATE executemany (valores absolutos y
+    deltas) sin confirmar la transacción. Los delta no bajan el stock de
+    0. Devuelve (productos actualizados, ids inexistentes).
+    """
+    ids = list(adjustments)
+    existing: set[int] = set()
+    for start in range(0, len(ids), ID_CHUNK_SIZE):
+        existing.update(db.session.scalars(
+            select(Product.id).where(Product.id.in_(ids[start:start + ID_CHUNK_SIZE]))))
+
+    sets = [{'b_id': id, 'b_value': value}
+            for id, (kind, value) in adjustments.items()
+            if kind == 'stock' and id in existing]
+    deltas = [{'b_id': id, 'b_value': value}
+              for id, (kind, value) in adjustments.items()
+              if kind == 'delta' and id in existing]
+
+    products = Product.__table__
+    where = products.c.id == bindparam('b_id')
+    if sets:
+        db.session.execute(
+            update(products).where(where).values(stock=bindparam('b_value')), sets)
+    if deltas:
+        new_stock = products.c.stock + bindparam('b_value')
+        db.session.execute(
+            update(products).where(where)
+            .values(stock=case((new_stock < 0, 0), else_=new_stock)), deltas)
+
+    not_found = sorted(id for id in ids if id not in existing)
+    return len(sets) + len(deltas), not_found
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
@@ -0,0 +1,55 @@
+import os
+import time
+from typing import Callable
+
+# La base de datos de los benchmarks es efímera salvo que se indique otra
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models import Category, Product  # noqa: E402
+
+
+def make_app(config_name: str = 'production', migrate: bool = False):
+    """
+    App con el esquema creado. migrate=True aplica las migraciones en vez de
+    create_all, para medir con el esquema de producción.
+    """
+    app = create_app(config_name)
+    with app.app_context():
+        if migrate:
+            from flask_migrate import upgrade
+            upgrade()
+        else:
+            db.create_all()
+    return app
+
+
+def seed_products(n: int, categories: int = 20) -> None:
+    """Inserta n productos repartidos en varias categorías (requiere app context)."""
+    category_rows = [Category(name=f'Category {i}', description=f'Category {i}')
+                     for i in range(categories)]
+    db.session.add_all(category_rows)
+    db.session.flush()
+
+    db.session.execute(Product.__table__.insert(), [
+        {
+            'name': f'Product {i}',
+            'description': f'Description for product {i}',
+            'price': round(1 + (i % 500) * 1.37, 2),
+            'stock': i % 50,
+            'image_url': f'https://example.com/images/{i}.jpg',
+            'category_id': category_rows[i % categories].id,
+        }
+        for i in range(n)
+    ])
+    db.session.commit()
+
+
+def timeit(fn: Callable[[], object], repeat: int) -> float:
+    """Devuelve operaciones por segundo de fn ejecutada repeat veces."""
+    fn()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return repeat / (time.perf_counter() - start)
@@ -0,0 +1,50 @@
+"""
+Benchmark de serialización del listado de productos.
+
+Uso (desde backend/):
+    python -m benchmarks.json_serialization [n_productos] [repeticiones]
+"""
+import sys
+
+from benchmarks.common import make_app, seed_products, timeit
+
+from flask import jsonify
+
+from app.extensions import db
+from app.models import Product
+from app.utils.serialization import IsoJSONProvider, OrjsonProvider, row_dicts, orjson
+
+
+def main(n: int = 10_000, repeat: int = 20) -> None:
+    app = make_app()
+
+    with app.app_context():
+        seed_products(n)
+
+        def orm_to_dict():
+            return jsonify([p.to_dict() for p in Product.query.all()])
+
+        def rows():
+            return jsonify(row_dicts(Product.query, Product))
+
+        cases = [
+            ('std   + ORM to_dict', IsoJSONProvider, orm_to_dict),
+            ('std   + row_dicts  ', IsoJSONProvider, rows),
+        ]
+        if orjson is not None:
+            cases += [
+                ('orjson + ORM to_dict', OrjsonProvider, orm_to_dict),
+                ('orjson + row_dicts  ', OrjsonProvider, rows),
+            ]
+
+        print(f'{n} productos, {repeat} repeticiones')
+        for label, provider, fn in cases:
+            app.json = provider(app)
+            size = len(fn().get_data())
+            print(f'{label}: {timeit(fn, repeat):8.2f} resp/s  ({size / 1024:.0f} KiB)')
+            # La identity map crece con cada carga ORM; se vacía entre casos
+            db.session.remove()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,457 @@
+"""
+Prueba de carga de la API completa con mezclas de tráfico (navegación,
+búsqueda, compra y edición de admin). Registra throughput, latencias
+p50/p95/p99 y consultas SQL por petición (cabecera Server-Timing) por
+endpoint, y guarda el resultado en JSON para comparar entre commits.
+
+Uso (desde backend/):
+    # En proceso con el test client de Flask, sobre una base temporal
+    python -m benchmarks.load --mix mixed --duration 20 --concurrency 8
+
+    # Contra gunicorn (gunicorn.conf.py) arrancado sobre la misma base
+    python -m benchmarks.load --gunicorn --workers 3 --concurrency 32
+
+    # Modo ASGI (uvicorn worker) con 200 conexiones keep-alive ociosas
+    python -m benchmarks.load --gunicorn --server uvicorn --idle-connections 200
+
+    # Contra un servidor ya en marcha, sembrado con benchmarks.seed
+    python -m benchmarks.load --url http://127.0.0.1:8080 --no-seed
+
+    # Diferencias entre dos resultados
+    python -m benchmarks.load --compare antes.json despues.json
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.parse
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Callable
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+SERVER_TIMING_QUERIES = re.compile(r'db;desc="(\d+) queries"')
+
+
+@dataclass
+class Call:
+    label: str
+    method: str
+    path: str
+    json: object = None
+    auth: str | None = None  # 'customer' o 'admin'
+
+
+@dataclass
+class Context:
+    """Lo que necesitan los escenarios para construir peticiones válidas."""
+    products: int
+    categories: list[int]
+    customer_tokens: list[str] = field(default_factory=list)
+    admin_token: str | None = None
+
+
+def browse(ctx: Context, rng: random.Random) -> Call:
+    roll = rng.random()
+    if roll < 0.35:
+        return Call('GET /products/', 'GET', '/products/?limit=20')
+    if roll < 0.5:
+        category = rng.choice(ctx.categories)
+        return Call('GET /products/?category_id', 'GET',
+                    f'/products/?limit=20&category_id={category}')
+    if roll < 0.8:
+        return Call('GET /products/<id>', 'GET', f'/products/{rng.randint(1, ctx.products)}')
+    if roll < 0.9:
+        return Call('GET /categories/', 'GET', '/categories/')
+    category = rng.choice(ctx.categories)
+    return Call('GET /categories/<id>/products', 'GET', f'/categories/{category}/products')
+
+
+def search(ctx: Context, rng: random.Random) -> Call:
+    from benchmarks.seed import WORDS
+    q = rng.choice(WORDS)[:rng.randint(3, 6)]
+    return Call('GET /products/search', 'GET', f'/products/search?q={q}&limit=20')
+
+
+def checkout(ctx: Context, rng: random.Random) -> Call:
+    if rng.random() < 0.3:
+        return Call('GET /orders/', 'GET', '/orders/', auth='customer')
+    items = [{'product_id': product_id, 'quantity': rng.randint(1, 3)}
+             for product_id in rng.sample(range(1, ctx.products + 1), rng.randint(1, 4))]
+    return Call('POST /orders/', 'POST', '/orders/', json={'items': items}, auth='customer')
+
+
+def admin(ctx: Context, rng: random.Random) -> Call:
+    if rng.random() < 0.7:
+        return Call('PUT /products/<id>', 'PUT', f'/products/{rng.randint(1, ctx.products)}',
+                    json={'price': round(rng.uniform(1, 2000), 2)}, auth='admin')
+    items = [{'id': rng.randint(1, ctx.products), 'delta': rng.randint(-5, 50)}
+             for _ in range(20)]
+    return Call('PUT /products/stock', 'PUT', '/products/stock',
+                json={'items': items}, auth='admin')
+
+
+SCENARIOS: dict[str, Callable[[Context, random.Random], Call]] = {
+    'browse': browse, 'search': search, 'checkout': checkout, 'admin': admin,
+}
+MIXES: dict[str, dict[str, float]] = {
+    'browse': {'browse': 1},
+    'search': {'search': 1},
+    'checkout': {'checkout': 1},
+    'admin': {'admin': 1},
+    'mixed': {'browse': 0.6, 'search': 0.2, 'checkout': 0.15, 'admin': 0.05},
+}
+
+
+class InProcessClient:
+    def __init__(self, app) -> None:
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, body: bytes | None,
+                headers: dict) -> tuple[int, dict, bytes]:
+        response = self.client.open(path, method=method, data=body, headers=headers)
+        return response.status_code, dict(response.headers), response.get_data()
+
+    def close(self) -> None:
+        pass
+
+
+class HttpClient:
+    """Una conexión keep-alive por hilo contra un servidor real."""
+
+    def __init__(self, base_url: str) -> None:
+        url = urllib.parse.urlsplit(base_url)
+        self.host, self.port = url.hostname, url.port or 80
+        self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+
+    def request(self, method: str, path: str, body: bytes | None,
+                headers: dict) -> tuple[int, http.client.HTTPMessage, bytes]:
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            response = self.conn.getresponse()
+            data = response.read()
+        except (http.client.HTTPException, OSError):
+            self.conn.close()
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+            raise
+        # HTTPMessage: cabeceras sin distinguir mayúsculas (uvicorn las
+        # envía en minúsculas)
+        return response.status, response.headers, data
+
+    def close(self) -> None:
+        # Una conexión keep-alive abierta retrasa el apagado de gunicorn
+        # hasta graceful_timeout
+        self.conn.close()
+
+
+def send(client, call: Call, ctx: Context, rng: random.Random) -> tuple[int, dict, bytes]:
+    headers = {}
+    body = None
+    if call.json is not None:
+        body = json.dumps(call.json).encode()
+        headers['Content-Type'] = 'application/json'
+    if call.auth == 'admin':
+        headers['Authorization'] = f'Bearer {ctx.admin_token}'
+    elif call.auth == 'customer':
+        headers['Authorization'] = f'Bearer {rng.choice(ctx.customer_tokens)}'
+    return client.request(call.method, call.path, body, headers)
+
+
+def login(client, email: str) -> str:
+    from benchmarks.seed import BENCH_PASSWORD
+    body = json.dumps({'email': email, 'password': BENCH_PASSWORD}).encode()
+    status, _, data = client.request('POST', '/auth/login', body,
+                                     {'Content-Type': 'application/json'})
+    if status != 200:
+        raise RuntimeError(f'Login de {email} falló con {status}')
+    return json.loads(data)['access_token']
+
+
+def run_load(make_client: Callable[[], object], ctx: Context, mix: dict[str, float],
+             duration: float, warmup: float, concurrency: int, seed: int) -> list[tuple]:
+    """
+    Lanza concurrency hilos que envían peticiones de la mezcla durante
+    warmup + duration segundos; solo se registran las de después del
+    calentamiento. Devuelve (label, segundos, status, consultas).
+    """
+    samples: list[tuple] = []
+    lock = threading.Lock()
+    start = time.monotonic()
+    measure_from, deadline = start + warmup, start + warmup + duration
+    names, weights = zip(*mix.items())
+
+    def worker(index: int) -> None:
+        rng = random.Random(seed + index)
+        client = make_client()
+        local = []
+        while (now := time.monotonic()) < deadline:
+            call = SCENARIOS[rng.choices(names, weights)[0]](ctx, rng)
+            t0 = time.perf_counter()
+            try:
+                status, headers, _ = send(client, call, ctx, rng)
+            except (http.client.HTTPException, OSError):
+                status, headers = 0, {}
+            elapsed = time.perf_counter() - t0
+            if now >= measure_from:
+                match = SERVER_TIMING_QUERIES.search(headers.get('Server-Timing', ''))
+                local.append((call.label, elapsed, status,
+                              int(match.group(1)) if match else None))
+        client.close()
+        with lock:
+            samples.extend(local)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Percentil por rango más cercano sobre una lista ya ordenada."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1,
+                       round(pct / 100 * len(sorted_values) + 0.5) - 1))
+    return sorted_values[index]
+
+
+def summarize(samples: list[tuple], duration: float) -> dict:
+    latencies = sorted(sample[1] for sample in samples)
+    queries = [sample[3] for sample in samples if sample[3] is not None]
+    statuses: dict[str, int] = defaultdict(int)
+    for sample in samples:
+        statuses[str(sample[2])] += 1
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for sample in samples if sample[2] == 0 or sample[2] >= 500),
+        'throughput_rps': round(len(samples) / duration, 2),
+        'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 99) * 1000, 2),
+        'queries_per_request': round(sum(queries) / len(queries), 2) if queries else None,
+        'statuses': dict(sorted(statuses.items())),
+    }
+
+
+def report(samples: list[tuple], duration: float) -> dict:
+    by_label: dict[str, list[tuple]] = defaultdict(list)
+    for sample in samples:
+        by_label[sample[0]].append(sample)
+    return {
+        'summary': summarize(samples, duration),
+        'endpoints': {label: summarize(rows, duration)
+                      for label, rows in sorted(by_label.items())},
+    }
+
+
+def print_report(result: dict) -> None:
+    print(f"{'endpoint':34} {'req':>7} {'rps':>8} {'p50':>8} {'p95':>8} "
+          f"{'p99':>8} {'q/req':>6} {'err':>5}")
+    rows = list(result['endpoints'].items()) + [('TOTAL', result['summary'])]
+    for label, stats in rows:
+        qpr = stats['queries_per_request']
+        print(f"{label:34} {stats['requests']:>7} {stats['throughput_rps']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} "
+              f"{'-' if qpr is None else qpr:>6} {stats['errors']:>5}")
+
+
+def compare(before_path: str, after_path: str) -> None:
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+
+    print(f"{'endpoint':34} {'rps':>24} {'p95 ms':>24} {'q/req':>12}")
+    labels = sorted(set(before['endpoints']) | set(after['endpoints']))
+    for label in labels + ['TOTAL']:
+        old = before['summary'] if label == 'TOTAL' else before['endpoints'].get(label)
+        new = after['summary'] if label == 'TOTAL' else after['endpoints'].get(label)
+        if not old or not new:
+            print(f'{label:34} solo en {"el segundo" if new else "el primero"}')
+            continue
+        print(f"{label:34} {_delta(old['throughput_rps'], new['throughput_rps']):>24} "
+              f"{_delta(old['p95_ms'], new['p95_ms']):>24} "
+              f"{old['queries_per_request']} -> {new['queries_per_request']}")
+
+
+def _delta(old: float, new: float) -> str:
+    change = (new - old) / old * 100 if old else 0.0
+    return f'{old}->{new} ({change:+.0f}%)'
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                              capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+SERVERS = {
+    'gthread': ('gthread', 'app.wsgi:app'),
+    'uvicorn': ('uvicorn.workers.UvicornWorker', 'app.asgi:application'),
+}
+
+
+def start_gunicorn(workers: int, port: int, env: dict[str, str] | None = None,
+                   server: str = 'gthread') -> subprocess.Popen:
+    """Arranca gunicorn con gunicorn.conf.py y espera a que /health responda."""
+    backend = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    worker_class, target = SERVERS[server]
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+         '-w', str(workers), '-k', worker_class, '-b', f'127.0.0.1:{port}',
+         target],
+        cwd=backend, env={**os.environ, 'FLASK_ENV': 'production', **(env or {})})
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            conn.request('GET', '/health')
+            if conn.getresponse().status == 200:
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError('gunicorn no respondió en /health')
+
+
+def open_idle_connections(base_url: str, count: int) -> list[http.client.HTTPConnection]:
+    """
+    Abre count conexiones keep-alive que hacen una petición y quedan
+    ociosas, como clientes lentos o móviles que mantienen el socket abierto.
+    """
+    parsed = urllib.parse.urlsplit(base_url)
+    connections = []
+    for _ in range(count):
+        conn = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=30)
+        conn.request('GET', '/health')
+        conn.getresponse().read()
+        connections.append(conn)
+    return connections
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--mix', choices=MIXES, default='mixed')
+    parser.add_argument('--duration', type=float, default=15, help='measured seconds')
+    parser.add_argument('--warmup', type=float, default=3, help='unmeasured seconds')
+    parser.add_argument('--concurrency', type=int, default=8, help='client threads')
+    parser.add_argument('--url', help='benchmark an already running server')
+    parser.add_argument('--gunicorn', action='store_true',
+                        help='start gunicorn on the benchmark database')
+    parser.add_argument('--workers', type=int, default=3, help='gunicorn workers')
+    parser.add_argument('--server', choices=SERVERS, default='gthread',
+                        help='gunicorn worker class (with --gunicorn)')
+    parser.add_argument('--idle-connections', type=int, default=0,
+                        help='idle keep-alive connections held open during the run')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--users', type=int, default=200)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--products', type=int, default=5_000)
+    parser.add_argument('--orders', type=int, default=2_000)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-seed', action='store_true',
+                        help='use the existing data in DATABASE_URL')
+    parser.add_argument('--output', help='results JSON path (default: benchmarks/results/)')
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    # Config lee el entorno al importarse: la base debe fijarse antes
+    if not args.url and 'DATABASE_URL' not in os.environ:
+        os.environ['DATABASE_URL'] = \
+            f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}"
+    # Las cuentas de consultas salen de la cabecera Server-Timing
+    os.environ.setdefault('SQL_INSTRUMENTATION', 'true')
+
+    from benchmarks.common import make_app
+    from benchmarks.seed import Dataset, seed_dataset, user_email
+
+    dataset = Dataset(args.users, args.categories, args.products, args.orders, args.seed)
+    if not args.url:
+        app = make_app(migrate=True)
+        if not args.no_seed:
+            with app.app_context():
+                seed_dataset(dataset)
+
+    server = None
+    if args.gunicorn:
+        server = start_gunicorn(args.workers, args.port, server=args.server)
+        base_url = f'http://127.0.0.1:{args.port}'
+    else:
+        base_url = args.url
+
+    idle = []
+    try:
+        if base_url:
+            idle = open_idle_connections(base_url, args.idle_connections)
+            make_client = lambda: HttpClient(base_url)  # noqa: E731
+            target = f'gunicorn-{args.server}' if args.gunicorn else base_url
+        else:
+            make_client = lambda: InProcessClient(app)  # noqa: E731
+            target = 'in-process'
+
+        client = make_client()
+        ctx = Context(products=args.products, categories=list(range(1, args.categories + 1)))
+        ctx.admin_token = login(client, user_email(0))
+        ctx.customer_tokens = [login(client, user_email(i))
+                               for i in range(1, min(args.users, args.concurrency + 1))]
+        client.close()
+
+        samples = run_load(make_client, ctx, MIXES[args.mix], args.duration,
+                           args.warmup, args.concurrency, args.seed)
+    finally:
+        for conn in idle:
+            conn.close()
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    result = {
+        'meta': {
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'git_commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpus': os.cpu_count(),
+            'target': target,
+            'workers': args.workers if args.gunicorn else None,
+            'mix': args.mix,
+            'duration': args.duration,
+            'warmup': args.warmup,
+            'concurrency': args.concurrency,
+            'idle_connections': args.idle_connections if base_url else 0,
+            'dataset': vars(dataset),
+        },
+        **report(samples, args.duration),
+    }
+    print_report(result)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{result['meta']['git_commit'] or 'local'}-"
+                     f"{'http' if base_url else 'inprocess'}-{args.mix}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w') as f:
+        json.dump(result, f, indent=2)
+    print(f'\nResultados en {output}')
+
+
+if __name__ == '__main__':
+    main()
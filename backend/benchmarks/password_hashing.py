@@ -0,0 +1,73 @@
+"""
+Benchmark de logins por segundo con peticiones concurrentes, hash en línea
+frente a pool de procesos.
+
+Uso (desde backend/):
+    python -m benchmarks.password_hashing [hilos] [logins_por_hilo] [procesos]
+"""
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Base de datos en fichero: varios hilos comparten conexión con la app
+os.environ.setdefault(
+    'DATABASE_URL', f"sqlite:///{tempfile.mkdtemp()}/bench_passwords.db")
+
+from benchmarks.common import make_app  # noqa: E402
+
+from app.extensions import db, password_hasher  # noqa: E402
+from app.models import User  # noqa: E402
+
+
+def run(app, threads: int, logins: int) -> tuple[float, float]:
+    """Devuelve (logins/s, latencia media en ms de un GET /health concurrente)."""
+    client = app.test_client()
+
+    def login(_):
+        for _ in range(logins):
+            response = client.post('/auth/login', json={
+                'email': 'bench@example.com', 'password': 'bench-password'})
+            assert response.status_code == 200, response.get_json()
+
+    health_latencies: list[float] = []
+
+    with ThreadPoolExecutor(max_workers=threads + 1) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(login, i) for i in range(threads)]
+        # Mide cuánto se degradan las peticiones baratas durante la ráfaga
+        while not all(f.done() for f in futures):
+            t = time.perf_counter()
+            client.get('/health')
+            health_latencies.append(time.perf_counter() - t)
+            time.sleep(0.01)
+        for f in futures:
+            f.result()
+        elapsed = time.perf_counter() - start
+
+    mean_health = sum(health_latencies) / max(len(health_latencies), 1)
+    return threads * logins / elapsed, mean_health * 1000
+
+
+def main(threads: int = 8, logins: int = 5, processes: int = 2) -> None:
+    app = make_app()
+
+    with app.app_context():
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('bench-password')
+        db.session.add(user)
+        db.session.commit()
+
+    print(f'{threads} hilos x {logins} logins, método {password_hasher.method}')
+    for workers in (0, processes):
+        password_hasher.workers = workers
+        password_hasher.shutdown()
+        label = 'en línea' if workers == 0 else f'pool de {workers} procesos'
+        rate, health_ms = run(app, threads, logins)
+        print(f'{label:>20}: {rate:7.2f} logins/s, GET /health {health_ms:6.2f} ms')
+    password_hasher.shutdown()
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
@@ -0,0 +1,109 @@
+"""
+Generador de datos para los benchmarks: usuarios, categorías, productos y
+pedidos históricos, deterministas a partir de una semilla.
+
+Uso (desde backend/, contra la base de datos de DATABASE_URL):
+    python -m benchmarks.seed [usuarios] [categorias] [productos] [pedidos]
+"""
+import random
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+
+BENCH_PASSWORD = 'bench-password'
+WORDS = ('laptop', 'phone', 'cable', 'monitor', 'keyboard', 'mouse', 'camera',
+         'speaker', 'charger', 'tablet', 'router', 'headset', 'printer', 'drive')
+
+
+@dataclass
+class Dataset:
+    users: int = 200
+    categories: int = 20
+    products: int = 5_000
+    orders: int = 2_000
+    seed: int = 42
+
+
+def user_email(index: int) -> str:
+    """Email del usuario sembrado index; el 0 es el admin."""
+    return f'bench{index}@example.com'
+
+
+def seed_dataset(dataset: Dataset) -> None:
+    """
+    Inserta el dataset con executemany (requiere app context y el esquema
+    creado). Todos los usuarios comparten la contraseña BENCH_PASSWORD y
+    el primero (user_email(0)) es admin.
+    """
+    from app.extensions import db, password_hasher
+    from app.models import Category, Order, OrderItem, Product, User
+
+    rng = random.Random(dataset.seed)
+    now = datetime.now(timezone.utc)
+    password_hash = password_hasher.hash(BENCH_PASSWORD)
+
+    db.session.execute(User.__table__.insert(), [
+        {
+            'username': f'bench{i}',
+            'email': user_email(i),
+            'password_hash': password_hash,
+            'role': 'admin' if i == 0 else 'customer',
+            'created_at': now,
+        }
+        for i in range(dataset.users)
+    ])
+
+    # ORM para que el evento de Category genere el slug
+    db.session.add_all(Category(name=f'Category {i}', description=f'Category {i}')
+                       for i in range(dataset.categories))
+    db.session.flush()
+    category_ids = list(db.session.scalars(db.select(Category.id)))
+
+    db.session.execute(Product.__table__.insert(), [
+        {
+            'name': f'{rng.choice(WORDS).title()} {rng.choice(WORDS)} {i}',
+            'description': ' '.join(rng.choices(WORDS, k=8)),
+            'price': round(rng.uniform(1, 2000), 2),
+            'stock': rng.randint(1_000, 100_000),
+            'image_url': f'https://example.com/images/{i}.jpg',
+            'category_id': rng.choice(category_ids),
+            'created_at': now - timedelta(minutes=i),
+        }
+        for i in range(dataset.products)
+    ])
+    db.session.flush()
+
+    user_ids = list(db.session.scalars(db.select(User.id)))
+    prices = dict(db.session.execute(db.select(Product.id, Product.price)).all())
+    product_ids = list(prices)
+
+    first_id = (db.session.scalar(db.select(db.func.max(Order.id))) or 0) + 1
+    orders, items = [], []
+    for order_id in range(first_id, first_id + dataset.orders):
+        lines = [(product_id, rng.randint(1, 3))
+                 for product_id in rng.sample(product_ids, rng.randint(1, 4))]
+        orders.append({
+            'id': order_id,
+            'user_id': rng.choice(user_ids),
+            'total': round(sum(prices[p] * q for p, q in lines), 2),
+            'status': rng.choice(('pending', 'processing', 'shipped', 'delivered')),
+            'created_at': now - timedelta(minutes=rng.randint(0, 60 * 24 * 90)),
+        })
+        items.extend({'order_id': order_id, 'product_id': p, 'quantity': q,
+                      'price': prices[p]} for p, q in lines)
+
+    if orders:
+        db.session.execute(Order.__table__.insert(), orders)
+        db.session.execute(OrderItem.__table__.insert(), items)
+    db.session.commit()
+
+
+if __name__ == '__main__':
+    from benchmarks.common import make_app
+
+    counts = [int(arg) for arg in sys.argv[1:5]]
+    dataset = Dataset(*counts)
+    app = make_app(migrate=True)
+    with app.app_context():
+        seed_dataset(dataset)
+    print(f'Seeded {dataset}')
@@ -0,0 +1,112 @@
+"""
+Benchmark de pedidos concurrentes sobre SQLite con y sin SQLITE_TUNING
+(WAL, synchronous=NORMAL, busy_timeout...). Cada proceso simula un worker
+de gunicorn: la mitad de sus hilos hacen POST /orders y la otra mitad leen
+GET /products/?limit=50 (sin caché) contra el mismo fichero.
+
+Uso (desde backend/):
+    python -m benchmarks.sqlite_concurrency [procesos] [hilos] [segundos]
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _configure(db_url: str, tuned: bool) -> None:
+    # Debe ejecutarse antes de importar la app: Config lee el entorno al importarse
+    os.environ['DATABASE_URL'] = db_url
+    os.environ['SQLITE_TUNING'] = 'true' if tuned else 'false'
+    os.environ['CATALOG_CACHE_TTL'] = '0'
+
+
+def setup(db_url: str, tuned: bool, products: int) -> None:
+    _configure(db_url, tuned)
+    from benchmarks.common import make_app, seed_products
+    from app.extensions import db
+    from app.models import Product, User
+
+    app = make_app()
+    with app.app_context():
+        seed_products(products)
+        db.session.execute(db.update(Product).values(stock=10_000_000))
+        db.session.add(User(username='bench', email='bench@example.com',
+                            password_hash='x'))
+        db.session.commit()
+
+
+def worker(db_url: str, tuned: bool, threads: int, seconds: float,
+           products: int, results) -> None:
+    _configure(db_url, tuned)
+    from benchmarks.common import make_app
+    from flask_jwt_extended import create_access_token
+
+    app = make_app()
+    with app.app_context():
+        headers = {'Authorization': f"Bearer {create_access_token(identity='1')}"}
+    client = app.test_client()
+    deadline = time.monotonic() + seconds
+
+    def run(seed: int) -> dict[str, int]:
+        counts: dict[str, int] = {}
+        i = seed
+        while time.monotonic() < deadline:
+            i += 7
+            if seed % 2:
+                response = client.get('/products/?limit=50')
+                key = f'GET {response.status_code}'
+            else:
+                response = client.post('/orders/', headers=headers, json={'items': [
+                    {'product_id': i % products + 1, 'quantity': 1},
+                    {'product_id': (i * 3) % products + 1, 'quantity': 2},
+                ]})
+                key = f'POST {response.status_code}'
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    totals: dict[str, int] = {}
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        for counts in pool.map(run, range(threads)):
+            for key, n in counts.items():
+                totals[key] = totals.get(key, 0) + n
+    results.put(totals)
+
+
+def main(processes: int = 3, threads: int = 4, seconds: float = 5,
+         products: int = 200) -> None:
+    ctx = multiprocessing.get_context('spawn')
+
+    print(f'{processes} procesos x {threads} hilos, {seconds}s por escenario')
+    for tuned in (False, True):
+        db_url = f"sqlite:///{tempfile.mkdtemp()}/bench_orders.db"
+        setup_process = ctx.Process(target=setup, args=(db_url, tuned, products))
+        setup_process.start()
+        setup_process.join()
+
+        results = ctx.Queue()
+        workers = [ctx.Process(target=worker, args=(
+            db_url, tuned, threads, seconds, products, results))
+            for _ in range(processes)]
+        for p in workers:
+            p.start()
+        totals: dict[str, int] = {}
+        for _ in workers:
+            for key, n in results.get().items():
+                totals[key] = totals.get(key, 0) + n
+        for p in workers:
+            p.join()
+
+        created = totals.get('POST 201', 0)
+        reads = totals.get('GET 200', 0)
+        failed = sum(n for key, n in totals.items()
+                     if key not in ('POST 201', 'GET 200'))
+        label = 'SQLITE_TUNING=true ' if tuned else 'SQLITE_TUNING=false'
+        print(f'{label}: {created / seconds:7.1f} pedidos/s, '
+              f'{reads / seconds:7.1f} lecturas/s, {failed} fallidas '
+              f'{dict(sorted(totals.items()))}')
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:4]))
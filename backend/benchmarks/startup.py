@@ -0,0 +1,79 @@
+"""
+Tiempo de arranque de un worker: import de la app, create_app(), primera
+petición y primera /apispec.json, más la memoria residual máxima, con la
+documentación generada en caliente, precompilada (`flask apispec`) y
+desactivada (API_DOCS_ENABLED=false). Cada medición usa un proceso nuevo.
+
+Uso (desde backend/):
+    python -m benchmarks.startup [repeticiones]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = '''
+import json, resource, time
+t0 = time.perf_counter()
+from app import create_app
+t1 = time.perf_counter()
+app = create_app('production')
+t2 = time.perf_counter()
+client = app.test_client()
+client.get('/health')
+t3 = time.perf_counter()
+spec = client.get('/apispec.json').status_code
+t4 = time.perf_counter()
+print(json.dumps({
+    'import_ms': (t1 - t0) * 1000,
+    'create_app_ms': (t2 - t1) * 1000,
+    'first_request_ms': (t3 - t2) * 1000,
+    'first_apispec_ms': (t4 - t3) * 1000 if spec == 200 else None,
+    'max_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+}))
+'''
+
+
+def measure(env: dict[str, str], repeat: int) -> dict[str, float | None]:
+    runs = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, '-c', PROBE], env={**os.environ, **env},
+            capture_output=True, text=True, check=True).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+    return {
+        key: round(statistics.median(run[key] for run in runs), 1)
+        if runs[0][key] is not None else None
+        for key in runs[0]
+    }
+
+
+def main(repeat: int = 5) -> None:
+    tmp = tempfile.mkdtemp()
+    spec_file = os.path.join(tmp, 'apispec.json')
+    base = {'DATABASE_URL': f"sqlite:///{os.path.join(tmp, 'startup.db')}",
+            'FLASK_APP': 'app.wsgi'}
+
+    subprocess.run([sys.executable, '-m', 'flask', 'apispec', spec_file],
+                   env={**os.environ, **base}, check=True, capture_output=True)
+
+    variants = {
+        'docs (live spec)': {**base, 'API_SPEC_FILE': ''},
+        'docs (prebuilt spec)': {**base, 'API_SPEC_FILE': spec_file},
+        'docs disabled': {**base, 'API_DOCS_ENABLED': 'false'},
+    }
+
+    print(f"{'variant':22} {'import':>8} {'create':>8} {'1st req':>8} "
+          f"{'apispec':>8} {'rss MB':>8}   (medianas de {repeat}, ms)")
+    for name, env in variants.items():
+        result = measure(env, repeat)
+        apispec = result['first_apispec_ms']
+        print(f"{name:22} {result['import_ms']:>8} {result['create_app_ms']:>8} "
+              f"{result['first_request_ms']:>8} {'-' if apispec is None else apispec:>8} "
+              f"{result['max_rss_mb']:>8}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
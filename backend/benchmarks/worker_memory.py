@@ -0,0 +1,103 @@
+"""
+Memoria por worker de gunicorn con y sin --preload (GUNICORN_PRELOAD).
+Tras calentar los workers con tráfico de lectura y escritura, lee
+/proc/<pid>/smaps_rollup de cada uno (solo Linux):
+
+- RSS: páginas residentes, incluidas las compartidas con el master.
+- PSS: RSS con las páginas compartidas repartidas entre quienes las usan;
+  la suma de PSS del master y los workers es la memoria real del servidor.
+- USS: páginas privadas del worker, lo que cuesta añadir uno más.
+
+Para decidir cuántos workers caben: (memoria de la VM - PSS del master -
+margen) / USS por worker.
+
+Uso (desde backend/, requiere gunicorn):
+    python -m benchmarks.worker_memory [workers] [peticiones_por_worker]
+"""
+import os
+import random
+import statistics
+import sys
+import tempfile
+
+
+def smaps_rollup(pid: int) -> dict[str, float]:
+    """Campos de /proc/<pid>/smaps_rollup en MB."""
+    fields: dict[str, float] = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    return {
+        'rss': fields['Rss'],
+        'pss': fields['Pss'],
+        'uss': fields['Private_Clean'] + fields['Private_Dirty'],
+    }
+
+
+def children(pid: int) -> list[int]:
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def measure(preload: bool, workers: int, requests: int, port: int) -> dict:
+    from benchmarks.load import (MIXES, SCENARIOS, Context, HttpClient, login,
+                                 send, start_gunicorn)
+    from benchmarks.seed import user_email
+
+    server = start_gunicorn(workers, port, {'GUNICORN_PRELOAD': 'true' if preload else 'false'})
+    clients: list[HttpClient] = []
+    try:
+        client = HttpClient(f'http://127.0.0.1:{port}')
+        clients.append(client)
+        ctx = Context(products=1_000, categories=list(range(1, 11)))
+        ctx.admin_token = login(client, user_email(0))
+        ctx.customer_tokens = [login(client, user_email(1))]
+        rng = random.Random(0)
+        names, weights = zip(*MIXES['mixed'].items())
+        # Con keep-alive cada conexión queda en un worker: se abren varias
+        for _ in range(workers * 2):
+            client = HttpClient(f'http://127.0.0.1:{port}')
+            clients.append(client)
+            for _ in range(requests // 2):
+                send(client, SCENARIOS[rng.choices(names, weights)[0]](ctx, rng), ctx, rng)
+
+        master = smaps_rollup(server.pid)
+        per_worker = [smaps_rollup(pid) for pid in children(server.pid)]
+    finally:
+        for client in clients:
+            client.close()
+        server.terminate()
+        server.wait(timeout=30)
+
+    return {
+        'master_pss': master['pss'],
+        **{f'worker_{key}': statistics.mean(w[key] for w in per_worker)
+           for key in ('rss', 'pss', 'uss')},
+        'total_pss': master['pss'] + sum(w['pss'] for w in per_worker),
+    }
+
+
+def main(workers: int = 3, requests: int = 200) -> None:
+    os.environ.setdefault(
+        'DATABASE_URL', f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'memory.db')}")
+    from benchmarks.common import make_app
+    from benchmarks.seed import Dataset, seed_dataset
+
+    app = make_app(migrate=True)
+    with app.app_context():
+        seed_dataset(Dataset(users=20, categories=10, products=1_000, orders=200))
+
+    print(f"{'mode':10} {'master PSS':>11} {'worker RSS':>11} {'worker PSS':>11} "
+          f"{'worker USS':>11} {'total PSS':>10}   (MB, {workers} workers)")
+    for preload in (False, True):
+        result = measure(preload, workers, requests, 8090)
+        print(f"{'preload' if preload else 'no preload':10} "
+              f"{result['master_pss']:>11.1f} {result['worker_rss']:>11.1f} "
+              f"{result['worker_pss']:>11.1f} {result['worker_uss']:>11.1f} "
+              f"{result['total_pss']:>10.1f}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,76 @@
+# Configuración de gunicorn; se carga automáticamente desde el directorio de
+# trabajo. Los flags de la línea de comandos (Dockerfile) tienen prioridad.
+import gc
+import os
+import shutil
+import subprocess
+import sys
+
+# Directorio compartido donde cada worker escribe sus métricas de Prometheus.
+# Debe existir en el entorno antes de que los workers importen la app.
+os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', '/tmp/devmart-metrics')
+
+# Con preload el master importa la app una vez y los workers la heredan por
+# copy-on-write en vez de importarla cada uno (GUNICORN_PRELOAD=false lo
+# desactiva, p. ej. para recargar código con HUP)
+preload_app = os.getenv('GUNICORN_PRELOAD', 'true') == 'true'
+
+# El master crea los ficheros de métricas al importar la app con preload,
+# antes de on_starting
+os.makedirs(os.environ['PROMETHEUS_MULTIPROC_DIR'], exist_ok=True)
+
+
+def on_starting(server):
+    # Los ficheros de una ejecución anterior falsearían los contadores
+    metrics_dir = os.environ['PROMETHEUS_MULTIPROC_DIR']
+    shutil.rmtree(metrics_dir, ignore_errors=True)
+    os.makedirs(metrics_dir, exist_ok=True)
+
+
+def when_ready(server):
+    if server.cfg.preload_app:
+        from app.utils.prefork import flask_app, freeze_app
+        freeze_app(flask_app(server.app.wsgi()))
+
+        # Los objetos de la app no se recorren en las colecciones de los
+        # workers, así que sus páginas de memoria siguen compartidas
+        gc.collect()
+        gc.freeze()
+
+    # En fly.io la base SQLite vive en el volumen de esta máquina, así que
+    # los workers de la cola corren aquí mismo junto a gunicorn
+    if os.getenv('RUN_JOB_WORKERS', 'false') == 'true':
+        server.job_workers = subprocess.Popen(
+            [sys.executable, os.path.join(os.path.dirname(__file__), 'worker.py')])
+
+
+def on_exit(server):
+    job_workers = getattr(server, 'job_workers', None)
+    if job_workers is not None:
+        job_workers.terminate()
+        job_workers.wait(timeout=30)
+
+
+def post_fork(server, worker):
+    if server.cfg.preload_app:
+        from app.utils.prefork import flask_app, reset_after_fork
+        reset_after_fork(flask_app(server.app.wsgi()))
+
+
+def post_worker_init(worker):
+    # Sin preload cada worker carga su propia app; se congela igualmente
+    if not worker.cfg.preload_app:
+        from app.utils.prefork import flask_app, freeze_app
+        freeze_app(flask_app(worker.wsgi))
+
+
+def worker_exit(server, worker):
+    # Los procesos del pool de contraseñas solo terminan cuando el pool se
+    # cierra; si el worker sale sin cerrarlo quedan huérfanos
+    from app.extensions import password_hasher
+    password_hasher.shutdown(wait=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -51,6 +51,18 @@ def get_metadata():
     return target_db.metadata
 
 
+# Índice de búsqueda de productos (migración c61b8e3f2a97): lo crean SQL a
+# mano y los eventos DDL de Product, no el metadata, así que autogenerate
+# los vería como sobrantes y los borraría
+SEARCH_OBJECTS = {'search_vector', 'ix_products_search_vector'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    if type_ == 'table' and name.startswith('products_fts'):
+        return False
+    return name not in SEARCH_OBJECTS
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -65,7 +77,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +106,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
@@ -0,0 +1,39 @@
+import os
+
+os.environ['DATABASE_URL'] = 'sqlite://'
+os.environ['PASSWORD_HASH_WORKERS'] = '0'
+
+import pytest  # noqa: E402
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.product import Product  # noqa: E402
+from app.utils.stock_sync import apply_adjustments, parse_adjustments  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app('development')
+    with app.app_context():
+        db.create_all()
+        db.session.add(Product(id=1, name='Laptop', price=10, stock=7))
+        db.session.commit()
+        yield app
+        db.drop_all()
+
+
+def test_delta_after_stock_does_not_go_below_zero():
+    assert parse_adjustments([{'id': 1, 'stock': 2}, {'id': 1, 'delta': -5}]) \
+        == {1: ('stock', 0)}
+
+
+def test_deltas_after_stock_apply_in_order():
+    assert parse_adjustments([{'id': 1, 'stock': 2}, {'id': 1, 'delta': -5},
+                              {'id': 1, 'delta': 3}]) == {1: ('stock', 3)}
+
+
+def test_applied_stock_after_negative_delta_is_zero(app):
+    adjustments = parse_adjustments([{'id': 1, 'stock': 2}, {'id': 1, 'delta': -5}])
+    assert apply_adjustments(adjustments) == (1, [])
+    db.session.commit()
+    assert db.session.get(Product, 1).stock == 0
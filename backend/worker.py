@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+"""Start the order pipeline workers that drain the jobs table"""
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import threading
+
+config_name = os.getenv('FLASK_ENV', 'development')
+
+
+def run_worker(once: bool = False) -> int:
+    from app import create_app
+    from app.utils import order_pipeline  # noqa: F401 (registra los handlers)
+    from app.utils.job_queue import work
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s [%(process)d] %(name)s %(levelname)s: %(message)s')
+    app = create_app(config_name)
+
+    # SIGTERM/SIGINT terminan el trabajo en curso antes de salir
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+
+    return work(app, stop, once=once)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('-w', '--workers', type=int,
+                        default=int(os.getenv('JOB_WORKERS', 2)),
+                        help='number of worker processes')
+    parser.add_argument('--once', action='store_true',
+                        help='process the pending jobs in this process and exit')
+    args = parser.parse_args()
+
+    if args.once:
+        print(f'Processed {run_worker(once=True)} jobs')
+    else:
+        ctx = multiprocessing.get_context('spawn')
+        processes = [ctx.Process(target=run_worker, name=f'job-worker-{i}')
+                     for i in range(args.workers)]
+        for process in processes:
+            process.start()
+
+        def shutdown(*_):
+            for process in processes:
+                process.terminate()
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+        for process in processes:
+            process.join()
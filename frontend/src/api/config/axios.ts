@@ -10,4 +10,23 @@ const axiosInstance = axios.create({
   },
 });
 
+// Tras una escritura la API devuelve Primary-Read-Until; reenviarla hace que
+// las lecturas siguientes vayan a la base primaria y no a una réplica atrasada
+let primaryReadUntil: string | null = null;
+
+axiosInstance.interceptors.response.use((response) => {
+  const until = response.headers['primary-read-until'];
+  if (until) {
+    primaryReadUntil = until;
+  }
+  return response;
+});
+
+axiosInstance.interceptors.request.use((config) => {
+  if (primaryReadUntil && Number(primaryReadUntil) * 1000 > Date.now()) {
+    config.headers['Primary-Read-Until'] = primaryReadUntil;
+  }
+  return config;
+});
+
 export default axiosInstance;